@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+# analytics_cube.py
+# -----------------------------------------------------------------------------
+# 집회/우회 통계 큐브 (대시보드 전용 사전 집계)
+# - 집회: 일 × 시간대(0~23시) × 관할서 × 신고인원 구간
+#   → 진행 중 건수/신고인원(걸친 시간대마다 집계), 시작 건수/신고인원(시작 시간대에만 집계)
+# - 우회: 일 × 정류소 → 우회 건수, 우회 시간(시간 단위) 합계
+# - 증분 갱신: 데이터가 다시 로드되면 일자별 지문(해시)을 비교해 바뀐 날짜만 재집계
+# - 조회는 일 번호로 정렬된 큐브를 이분 탐색으로 잘라 사용 (원본 프레임 스캔 없음)
+# -----------------------------------------------------------------------------
+import threading
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from data_core import DAY_NA, MIN_NA, day_num, day_to_date
+
+# 신고인원 구간 (하한 기준), 결측은 "미상"
+HEAD_BANDS = [0, 100, 500, 1000, 5000]
+HEAD_BAND_LABELS = ["~99명", "100~499명", "500~999명", "1000~4999명", "5000명 이상", "미상"]
+
+EVENT_CUBE_COLUMNS = ["day", "hour", "district", "band", "events", "head_sum", "starts", "start_head"]
+STOP_CUBE_COLUMNS = ["day", "ARS_ID", "정류소명", "detours", "detour_hours"]
+
+
+def head_band(head: np.ndarray, missing: np.ndarray) -> np.ndarray:
+    band = np.searchsorted(HEAD_BANDS, head, side="right") - 1
+    return np.where(missing, len(HEAD_BANDS), np.clip(band, 0, len(HEAD_BANDS) - 1)).astype(np.int8)
+
+
+def _day_fingerprints(df: pd.DataFrame, day_col: str, cols: list[str]) -> pd.Series:
+    """일 번호 → 그 날짜 행들의 해시 합 (행 순서와 무관, 바뀐 날짜 판별용)"""
+    h = pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+    return pd.Series(h, index=df[day_col].to_numpy()).groupby(level=0).sum()
+
+
+def event_cells(df: pd.DataFrame) -> pd.DataFrame:
+    """컴팩트 집회 프레임 → 큐브 셀 (일, 시간대, 관할서, 인원구간)"""
+    if df.empty:
+        return pd.DataFrame(columns=EVENT_CUBE_COLUMNS)
+    s = df["_start_min"].to_numpy(dtype=np.int64)
+    e = df["_end_min"].to_numpy(dtype=np.int64)
+    h0 = s // 60
+    h1 = np.where(e > s, (e - 1) // 60, 23)  # 종료가 시작보다 이르면(자정 넘김) 당일 23시까지
+    n = h1 - h0 + 1
+    rep = np.repeat(np.arange(len(df)), n)
+    offset = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+    hour = h0[rep] + offset
+    head = df["_head"]
+    missing = head.isna().to_numpy()
+    head_v = head.to_numpy(dtype=np.int64, na_value=0)
+    cells = pd.DataFrame(
+        {
+            "day": df["_day"].to_numpy()[rep],
+            "hour": hour.astype(np.int8),
+            "district": np.asarray(df["_dist"], dtype=object)[rep],
+            "band": head_band(head_v, missing)[rep],
+            "head": head_v[rep],
+            "start": (offset == 0).astype(np.int64),
+        }
+    )
+    cells["start_head"] = cells["head"] * cells["start"]
+    out = cells.groupby(["day", "hour", "district", "band"], sort=True).agg(
+        events=("head", "size"), head_sum=("head", "sum"), starts=("start", "sum"), start_head=("start_head", "sum")
+    )
+    return out.reset_index()
+
+
+def stop_cells(bus_df: pd.DataFrame) -> pd.DataFrame:
+    """컴팩트 버스 우회 프레임 → 정류소별 우회 건수/시간 (시작일 기준)"""
+    if bus_df is None or bus_df.empty:
+        return pd.DataFrame(columns=STOP_CUBE_COLUMNS)
+    s_min = bus_df["start_min"].to_numpy(dtype=np.int64)
+    e_min = bus_df["end_min"].to_numpy(dtype=np.int64)
+    s_min = np.where(s_min == MIN_NA, 0, s_min)        # 시각 미상 → 하루 전체
+    e_min = np.where(e_min == MIN_NA, 1440, e_min)
+    start = bus_df["start_day"].to_numpy(dtype=np.int64) * 1440 + s_min
+    end = bus_df["end_day"].to_numpy(dtype=np.int64) * 1440 + e_min
+    cells = pd.DataFrame(
+        {
+            "day": bus_df["start_day"].to_numpy(),
+            "ARS_ID": np.asarray(bus_df["ARS_ID"], dtype=object),
+            "정류소명": np.asarray(bus_df["정류소명"], dtype=object),
+            "hours": np.clip(end - start, 0, None) / 60.0,
+        }
+    )
+    out = cells.groupby(["day", "ARS_ID", "정류소명"], sort=True).agg(
+        detours=("hours", "size"), detour_hours=("hours", "sum")
+    )
+    return out.reset_index()
+
+
+class _Partitioned:
+    """일자별 부분 집계 + 합쳐 둔 정렬 큐브
+
+    (큐브, 일 번호 배열)은 한 튜플로 교체해 잠금 없이 읽는 쪽도 항상 짝이 맞는 쌍을 본다.
+    """
+
+    def __init__(self, columns: list[str], build):
+        self.columns, self.build = columns, build
+        self.parts: dict[int, pd.DataFrame] = {}
+        self.prints: dict[int, int] = {}
+        self._view = (pd.DataFrame(columns=columns), np.empty(0, dtype=np.int64))
+
+    @property
+    def cube(self) -> pd.DataFrame:
+        return self._view[0]
+
+    @property
+    def days(self) -> np.ndarray:
+        return self._view[1]
+
+    def update(self, frame: pd.DataFrame, day_col: str, hash_cols: list[str]) -> int:
+        """바뀐 날짜만 다시 집계. 재집계한 날짜 수 반환"""
+        if frame is None or frame.empty:
+            changed = len(self.parts)
+            self.parts.clear()
+            self.prints.clear()
+        else:
+            prints = _day_fingerprints(frame, day_col, hash_cols)
+            prints = prints[prints.index != DAY_NA]
+            dirty = [int(d) for d, fp in prints.items() if self.prints.get(int(d)) != int(fp)]
+            gone = set(self.prints) - set(int(d) for d in prints.index)
+            for d in gone:
+                self.parts.pop(d, None)
+                self.prints.pop(d, None)
+            if dirty:
+                sub = frame[frame[day_col].isin(dirty)]
+                cells = self.build(sub)
+                for d in dirty:
+                    self.prints[d] = int(prints[d])
+                    self.parts.pop(d, None)
+                for d, part in cells.groupby("day", sort=False):
+                    self.parts[int(d)] = part
+            changed = len(dirty) + len(gone)
+        if changed:
+            keys = sorted(self.parts)
+            cube = (
+                pd.concat([self.parts[k] for k in keys], ignore_index=True)
+                if keys else pd.DataFrame(columns=self.columns)
+            )
+            self._view = (cube, cube["day"].to_numpy(dtype=np.int64))
+        return changed
+
+    def slice(self, lo: int, hi: int) -> pd.DataFrame:
+        """일 번호 [lo, hi] 구간 (정렬된 큐브를 이분 탐색으로 자름)"""
+        cube, days = self._view  # 한 번에 읽음 (sync 중 교체돼도 짝이 어긋나지 않음)
+        a, b = np.searchsorted(days, [lo, hi + 1])
+        return cube.iloc[a:b]
+
+
+class AnalyticsCube:
+    """대시보드용 사전 집계 큐브. sync()로 데이터 로드 시점에 증분 갱신"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._token = None
+        self._months: list[tuple[int, int]] = []
+        self.events = _Partitioned(EVENT_CUBE_COLUMNS, event_cells)
+        self.stops = _Partitioned(STOP_CUBE_COLUMNS, stop_cells)
+
+    def sync(self, df: pd.DataFrame, bus_df: pd.DataFrame, token: tuple[int, ...] | None = None) -> dict:
+        """token: 소스별 데이터 버전 튜플. 모든 버전이 지금 것 이하면(같거나 늦게 도착한 옛 프레임)
+        아무 것도 하지 않음. 소스별 재집계 날짜 수 반환"""
+        changed = {"events": 0, "stops": 0}
+        with self._lock:
+            if token is not None and self._token is not None and all(t <= c for t, c in zip(token, self._token)):
+                return changed
+            changed["events"] = self.events.update(
+                df, "_day", ["_day", "_start_min", "_end_min", "_dist", "_head"]
+            )
+            changed["stops"] = self.stops.update(
+                bus_df, "start_day", ["start_day", "start_min", "end_day", "end_min", "ARS_ID", "정류소명"]
+            )
+            if changed["events"] or changed["stops"]:
+                self._months = self._month_range()
+            self._token = token
+        return changed
+
+    def _month_range(self) -> list[tuple[int, int]]:
+        days = np.union1d(self.events.days, self.stops.days)
+        if not len(days):
+            return []
+        first, last = day_to_date(days[0]), day_to_date(days[-1])
+        out, (y, m) = [], (first.year, first.month)
+        while (y, m) <= (last.year, last.month):
+            out.append((y, m))
+            y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        return out
+
+    # ---- 조회 (대시보드) ----
+    def months(self) -> list[tuple[int, int]]:
+        """큐브에 데이터가 있는 첫 달 ~ 마지막 달 (연, 월)"""
+        return list(self._months)
+
+    def event_slice(self, start: date, end: date) -> pd.DataFrame:
+        return self.events.slice(day_num(start), day_num(end))
+
+    def stop_slice(self, start: date, end: date) -> pd.DataFrame:
+        return self.stops.slice(day_num(start), day_num(end))
+
+    def head_by_hour_district(self, start: date, end: date) -> pd.DataFrame:
+        """시간대 × 관할서 신고인원 합계 (행: 0~23시)"""
+        cells = self.event_slice(start, end)
+        out = cells.pivot_table(index="hour", columns="district", values="head_sum", aggfunc="sum", fill_value=0)
+        return out.reindex(range(24), fill_value=0)
+
+    def events_by_band(self, start: date, end: date) -> pd.Series:
+        """신고인원 구간별 집회 건수"""
+        cells = self.event_slice(start, end)
+        s = cells.groupby("band")["starts"].sum().reindex(range(len(HEAD_BAND_LABELS)), fill_value=0)
+        s.index = HEAD_BAND_LABELS
+        return s
+
+    def daily_head(self, start: date, end: date) -> pd.Series:
+        """일자별 신고인원 합계 (집회당 1회, 시작 시간대 기준)"""
+        cells = self.event_slice(start, end)
+        s = cells.groupby("day")["start_head"].sum()
+        s.index = [day_to_date(d) for d in s.index]
+        return s
+
+    def top_stops(self, start: date, end: date, n: int = 15) -> pd.DataFrame:
+        cells = self.stop_slice(start, end)
+        out = cells.groupby(["ARS_ID", "정류소명"], sort=False)[["detours", "detour_hours"]].sum()
+        return out.sort_values(["detour_hours", "detours"], ascending=False).head(n).reset_index()
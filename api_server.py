@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+# api_server.py
+# -----------------------------------------------------------------------------
+# 읽기 전용 JSON API (키오스크/구청 홈페이지/정류장 안내기용)
+# - GET /events?date=YYYY-MM-DD   해당 날짜 집회 목록
+# - GET /detours?date=YYYY-MM-DD  해당 날짜 우회 정류소 + 경유 노선
+# - GET /routes/{route}           노선별 우회 날짜/정류소
+# - 앱과 같은 로더(data_core) + 데이터 버전 레지스트리(data_watch) 사용
+# - ETag(데이터 상태 + 요청 + 인코딩) / If-None-Match → 304, gzip, 응답 바이트 LRU 캐시
+# - 데이터 파일이 바뀌면 백그라운드에서 다시 로드, 그동안은 이전 데이터로 응답
+# 사용 예) python api_server.py --port 8600
+# -----------------------------------------------------------------------------
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from dateutil import parser
+
+import data_core
+from data_watch import DataVersionRegistry
+
+MAX_AGE = 15  # 초: 클라이언트/프록시 캐시 허용 시간 (그 뒤엔 ETag로 재검증)
+
+
+class DataStore:
+    """데이터 버전이 바뀐 소스만 다시 로드하는 프레임 보관소 (스레드 안전)
+
+    다시 로드는 백그라운드 스레드에서 하고, 끝날 때까지는 이전 프레임을 계속 돌려준다.
+    """
+
+    def __init__(self, registry: DataVersionRegistry, events_path: str, bus_path: str, routes_path: str):
+        self.registry = registry
+        self.paths = {"events": events_path, "bus": bus_path, "routes": routes_path}
+        self._loaders = {"events": data_core.load_events, "bus": data_core.load_bus, "routes": data_core.load_routes}
+        self._frames: dict[str, tuple[int, str, object]] = {}  # 이름 → (버전, 파일 상태 태그, 프레임)
+        self._loading: set[str] = set()
+        self._lock = threading.Lock()
+        self._first_lock = threading.Lock()  # 이전 프레임이 없을 때(최초 로드)만 기다림
+
+    def _load(self, name: str, ver: int) -> None:
+        path = self.paths[name]
+        # 읽기 전 상태로 태그를 잡음 (읽는 중 파일이 바뀌면 버전이 또 올라 다시 로드됨)
+        tag = self.registry.etag(path)
+        frame = self._loaders[name](path)
+        with self._lock:
+            cur = self._frames.get(name)
+            if cur is None or cur[0] < ver:
+                self._frames[name] = (ver, tag, frame)
+
+    def _reload(self, name: str, ver: int) -> None:
+        try:
+            self._load(name, ver)
+        except Exception:
+            pass  # 실패하면 이전 프레임 유지, 다음 요청에서 다시 시도
+        finally:
+            with self._lock:
+                self._loading.discard(name)
+
+    def snapshot(self, name: str) -> tuple[str, object]:
+        """(파일 상태 태그, 프레임). 새 버전을 읽는 중이면 이전 것"""
+        ver = self.registry.version(self.paths[name])
+        hit = self._frames.get(name)
+        if hit is None:
+            with self._first_lock:
+                if name not in self._frames:
+                    self._load(name, ver)
+            hit = self._frames[name]
+        elif hit[0] != ver:
+            with self._lock:
+                start = name not in self._loading
+                self._loading.add(name)
+            if start:
+                threading.Thread(target=self._reload, args=(name, ver), name=f"reload-{name}", daemon=True).start()
+        return hit[1], hit[2]
+
+    def get(self, name: str):
+        return self.snapshot(name)[1]
+
+
+class ResponseCache:
+    """ETag(인코딩별로 다름) → 인코딩된 응답 바이트 LRU"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            v = self._data.get(key)
+            if v is not None:
+                self._data.move_to_end(key)
+            return v
+
+    def put(self, key, value: bytes):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _parse_date(qs: dict) -> date:
+    raw = (qs.get("date") or [""])[0].strip()
+    if not raw:
+        return date.today()
+    try:
+        return parser.parse(raw).date()
+    except Exception:
+        raise ApiError(400, f"잘못된 날짜 형식입니다: {raw}")
+
+
+def resolve(path: str, qs: dict):
+    """요청 → (ETag에 쓸 데이터 소스들, 캐시 키용 정규화 요청, payload 생성 함수(소스별 프레임 dict))"""
+    if path == "/events":
+        d = _parse_date(qs)
+        return ("events",), f"events:{d}", lambda f: {"date": d.isoformat(), "events": data_core.events_payload(f["events"], d)}
+    if path == "/detours":
+        d = _parse_date(qs)
+        return ("bus", "routes"), f"detours:{d}", lambda f: {
+            "date": d.isoformat(),
+            "stops": data_core.detours_payload(f["bus"], f["routes"], d),
+        }
+    if path.startswith("/routes/") and len(path) > len("/routes/"):
+        route = unquote(path[len("/routes/"):]).strip()
+        return ("routes", "bus"), f"routes:{route}", lambda f: data_core.route_payload(f["routes"], f["bus"], route)
+    raise ApiError(404, "지원하지 않는 경로입니다. (/events, /detours, /routes/{route})")
+
+
+def _etag_tokens(header: str | None) -> set[str]:
+    """If-None-Match 값 → 태그 집합 (약한 비교: W/ 접두어 무시)"""
+    tags = set()
+    for t in (header or "").split(","):
+        t = t.strip()
+        tags.add(t[2:] if t.startswith("W/") else t)
+    return tags
+
+
+def _accepts_gzip(header: str | None) -> bool:
+    """Accept-Encoding에서 gzip의 q값이 0보다 큰지 (명시 없으면 * 의 q값, 둘 다 없으면 False)"""
+    q = {}
+    for part in (header or "").split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for p in params.split(";"):
+            k, _, v = p.partition("=")
+            if k.strip().lower() == "q":
+                try:
+                    weight = float(v.strip())
+                except ValueError:
+                    weight = 0.0
+        q[name] = weight
+    if "gzip" in q:
+        return q["gzip"] > 0
+    if "x-gzip" in q:
+        return q["x-gzip"] > 0
+    return q.get("*", 0) > 0
+
+
+def make_handler(store: DataStore, cache: ResponseCache):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            use_gzip = _accepts_gzip(self.headers.get("Accept-Encoding"))
+            try:
+                sources, req_key, build = resolve(url.path.rstrip("/") or "/", parse_qs(url.query))
+                # 실제로 응답을 만들 프레임(다시 로드 중이면 이전 것)의 상태로 ETag 생성
+                snaps = {n: store.snapshot(n) for n in sources}
+                state = hashlib.sha1("|".join(snaps[n][0] for n in sources).encode("utf-8")).hexdigest()[:16]
+                base = f"{state}-{hashlib.sha1(req_key.encode('utf-8')).hexdigest()[:10]}"
+                # 콘텐츠 인코딩이 다르면 다른 강한 검증자 (RFC 9110 8.8.3)
+                etag = f'"{base}-gz"' if use_gzip else f'"{base}"'
+                inm = _etag_tokens(self.headers.get("If-None-Match"))
+                if "*" in inm or etag in inm:
+                    self._send_not_modified(etag)
+                    return
+                body = cache.get(etag)
+                if body is None:
+                    raw = json.dumps(build({n: snaps[n][1] for n in sources}), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                    body = gzip.compress(raw, compresslevel=6) if use_gzip else raw
+                    cache.put(etag, body)
+                self._send(200, body, etag=etag, gzipped=use_gzip)
+            except ApiError as e:
+                self._send(e.status, json.dumps({"error": str(e)}, ensure_ascii=False).encode("utf-8"), cacheable=False)
+            except Exception as e:
+                self._send(500, json.dumps({"error": f"서버 오류: {e}"}, ensure_ascii=False).encode("utf-8"), cacheable=False)
+
+        def _send(self, status: int, body: bytes, etag: str | None = None, gzipped: bool = False, cacheable: bool = True):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Vary", "Accept-Encoding")
+            if cacheable:
+                self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+            if etag:
+                self.send_header("ETag", etag)
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def _send_not_modified(self, etag: str):
+            # 304는 본문이 없으므로 Content-Length/Content-Type은 보내지 않음 (RFC 9110 15.4.5)
+            self.send_response(304)
+            self.send_header("Vary", "Accept-Encoding")
+            self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+            self.send_header("ETag", etag)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="집회/버스 우회 읽기 전용 JSON API")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8600)
+    ap.add_argument("--events", default="data/protest_data.xlsx", help="집회 데이터 경로 (xlsx/csv)")
+    ap.add_argument("--bus", default="data/bus_data.xlsx", help="버스 우회 데이터 경로 (xlsx)")
+    ap.add_argument("--routes", default="routes_final.csv", help="버스 노선 데이터 경로 (CSV)")
+    args = ap.parse_args()
+
+    registry = DataVersionRegistry()
+    for path in (args.events, args.bus, args.routes):
+        registry.watch(path)  # 설정 소스로 고정 (watchdog 감시, LRU 제거 대상 아님)
+    store = DataStore(registry.start(), args.events, args.bus, args.routes)
+    for name in ("events", "bus", "routes"):
+        store.get(name)  # 첫 요청 지연 방지용 선로딩
+    srv = ThreadingHTTPServer((args.host, args.port), make_handler(store, ResponseCache()))
+    print(f"API 서버 시작: http://{args.host}:{args.port}  (/events?date=, /detours?date=, /routes/{{route}})")
+    srv.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
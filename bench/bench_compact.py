@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# bench/bench_compact.py
+# -----------------------------------------------------------------------------
+# 컴팩트 스키마 메모리/캐시 히트 비용 리포트
+# - 합성 원본 프레임(파일 I/O 없이 메모리에서 생성)을 data_core.normalize_*로 변환
+# - 비교 대상(legacy): 예전 로더 반환 형태 = 원본 컬럼 + object 타입 표준 컬럼
+#   (date 객체, "HH:MM" 문자열, 반복 문자열)
+# - 측정: memory_usage(deep=True), 피클 크기, 피클 왕복 시간(st.cache_data 히트 비용)
+# 사용 예) python bench/bench_compact.py --scales 100000 1000000
+# -----------------------------------------------------------------------------
+import argparse
+import pickle
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import data_core  # noqa: E402
+from gen_synthetic import make_bus, make_protests, make_routes  # noqa: E402
+
+
+def _legacy_events(raw: pd.DataFrame, compact: pd.DataFrame) -> pd.DataFrame:
+    dec = data_core.decode_events(compact)
+    legacy = raw.iloc[: len(dec)].reset_index(drop=True)
+    for c in ["_date", "_start", "_end", "_loc", "_dist", "_head", "_memo", "__link", "__title"]:
+        legacy[c] = dec[c].astype(object).to_numpy()
+    return legacy
+
+
+def _legacy_routes(compact: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": [data_core.day_to_date(x) for x in compact["day"]],
+            "ars_id": compact["ars_id"].astype(str).astype(object),
+            "route": compact["route"].astype(str).astype(object),
+        }
+    )
+
+
+def _cost(df: pd.DataFrame, repeat: int = 3) -> dict:
+    mem = df.memory_usage(deep=True).sum() / 1e6
+    blob = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        pickle.loads(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+        runs.append((time.perf_counter() - t0) * 1000.0)
+    return {"mem_mb": mem, "pickle_mb": len(blob) / 1e6, "hit_ms": float(np.median(runs))}
+
+
+def report(rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    raw_ev, raw_bus, raw_rt = make_protests(rng, rows), make_bus(rng, rows), make_routes(rng, rows)
+    # 예전 로더처럼 시각은 문자열/object로 들어온다고 가정
+    raw_ev = raw_ev.astype({"start_time": object, "end_time": object})
+
+    ev = data_core.normalize_events(raw_ev)
+    bus = data_core.normalize_bus(raw_bus)
+    rt = data_core.normalize_routes(raw_rt)
+    pairs = {
+        "events": (_legacy_events(raw_ev, ev), ev),
+        "bus": (data_core.decode_bus(bus).astype({"ARS_ID": object, "정류소명": object}), bus),
+        "routes": (_legacy_routes(rt), rt),
+    }
+    print(f"[compact] rows={rows}")
+    print(f"  {'frame':8s} {'legacy MB':>10s} {'compact MB':>11s} {'x':>6s}   "
+          f"{'pickle MB':>16s}   {'cache hit ms':>18s}")
+    for name, (old, new) in pairs.items():
+        a, b = _cost(old), _cost(new)
+        print(
+            f"  {name:8s} {a['mem_mb']:10.1f} {b['mem_mb']:11.1f} {a['mem_mb'] / max(b['mem_mb'], 1e-9):6.1f}   "
+            f"{a['pickle_mb']:7.1f} → {b['pickle_mb']:6.1f}   {a['hit_ms']:8.1f} → {b['hit_ms']:7.1f}"
+        )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="컴팩트 스키마 메모리/캐시 히트 비용 리포트")
+    ap.add_argument("--scales", type=int, nargs="+", default=[100000, 1000000])
+    args = ap.parse_args()
+    for rows in args.scales:
+        report(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# bench/bench_data_path.py
+# -----------------------------------------------------------------------------
+# 데이터 경로 벤치마크 (로더 → 일자 필터 → 캘린더 도트 → 워드클라우드)
+# - 규모별 합성 데이터는 bench/_data/<rows>에 없으면 생성 (gen_synthetic.py)
+# - 결과는 JSON으로 저장, baseline.json과 비교해 회귀(느려짐) 여부 판정
+# 사용 예)
+#   python bench/bench_data_path.py --scales 1000 10000 --save-baseline
+#   python bench/bench_data_path.py --scales 1000 10000 --compare
+# -----------------------------------------------------------------------------
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import data_core  # noqa: E402
+from gen_synthetic import generate  # noqa: E402
+
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+FONT_PATH = str(BENCH_DIR.parent / "data/Nanum_Gothic/NanumGothic-Regular.ttf")
+
+
+def _time(fn, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000.0)
+    return {"median_ms": round(statistics.median(runs), 3), "min_ms": round(min(runs), 3), "repeat": repeat}
+
+
+def _busiest_day(series):
+    return data_core.day_to_date(series.value_counts().idxmax())
+
+
+def bench_scale(rows: int, repeat: int, protest_format: str) -> dict:
+    data_dir = BENCH_DIR / "_data" / str(rows)
+    paths = {
+        "events": data_dir / f"protest_data.{protest_format}",
+        "bus": data_dir / "bus_data.xlsx",
+        "routes": data_dir / "routes_final.csv",
+        "feedback": data_dir / "feedback.csv",
+    }
+    if not all(p.exists() for p in paths.values()):
+        generate(str(data_dir), rows, protest_format=protest_format)
+
+    # 로더는 무거우므로 규모가 크면 반복 횟수를 줄임
+    load_repeat = max(1, repeat if rows <= 10_000 else repeat // 3)
+    out = {}
+    out["load_events"] = _time(lambda: data_core.load_events(str(paths["events"])), load_repeat)
+    out["load_bus"] = _time(lambda: data_core.load_bus(str(paths["bus"])), load_repeat)
+    out["load_routes"] = _time(lambda: data_core.load_routes(str(paths["routes"])), load_repeat)
+
+    events = data_core.load_events(str(paths["events"]))
+    bus = data_core.load_bus(str(paths["bus"]))
+    feedback = data_core.load_feedback(str(paths["feedback"]))
+    d_ev = _busiest_day(events["_day"])
+    d_bus = _busiest_day(bus["start_day"])
+    d_fb = feedback["date"].value_counts().idxmax()
+
+    out["filter_by_day"] = _time(lambda: data_core.filter_by_day(events, d_ev), repeat)
+    out["get_bus_rows_for_date"] = _time(lambda: data_core.get_bus_rows_for_date(bus, d_bus), repeat)
+    out["df_to_month_dots"] = _time(lambda: data_core.df_to_month_dots(events), load_repeat)
+    if data_core.WORDCLOUD_AVAILABLE:
+        out["build_wordcloud_image"] = _time(
+            lambda: data_core.build_wordcloud_image(feedback, date_filter=d_fb, font_path=FONT_PATH), load_repeat
+        )
+    return out
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """baseline 대비 median이 threshold배 이상 느려진 항목 목록"""
+    regressions = []
+    for scale, funcs in results.items():
+        for name, r in funcs.items():
+            b = baseline.get(scale, {}).get(name)
+            if not b:
+                continue
+            ratio = r["median_ms"] / max(b["median_ms"], 1e-6)
+            flag = "REGRESSION" if ratio >= threshold else "ok"
+            print(f"{scale:>8s} {name:24s} {b['median_ms']:10.2f} → {r['median_ms']:10.2f} ms  x{ratio:5.2f}  {flag}")
+            if ratio >= threshold:
+                regressions.append(f"{name}@{scale}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="데이터 경로 벤치마크")
+    ap.add_argument("--scales", type=int, nargs="+", default=[1000, 10000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--protest-format", choices=["xlsx", "csv"], default="xlsx")
+    ap.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    ap.add_argument("--save-baseline", action="store_true", help="결과를 bench/baseline.json으로 저장")
+    ap.add_argument("--compare", action="store_true", help="bench/baseline.json과 비교 (회귀 시 exit 1)")
+    ap.add_argument("--threshold", type=float, default=1.3, help="회귀 판정 배수 (기본 1.3배)")
+    args = ap.parse_args()
+
+    results = {}
+    for rows in args.scales:
+        print(f"[bench] rows={rows}")
+        results[str(rows)] = bench_scale(rows, args.repeat, args.protest_format)
+        for name, r in results[str(rows)].items():
+            print(f"  {name:24s} median {r['median_ms']:10.2f} ms  min {r['min_ms']:10.2f} ms")
+
+    doc = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "protest_format": args.protest_format,
+        "results": results,
+    }
+    if args.out:
+        Path(args.out).write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        BASELINE_PATH.write_text(json.dumps(doc, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"baseline 저장: {BASELINE_PATH}")
+    if args.compare:
+        if not BASELINE_PATH.exists():
+            print("baseline.json이 없습니다. --save-baseline으로 먼저 생성하세요.")
+            sys.exit(2)
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("회귀 발생: " + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# bench/gen_synthetic.py
+# -----------------------------------------------------------------------------
+# 벤치마크용 합성 데이터 생성기 (시드 고정 → 같은 입력이면 항상 같은 파일)
+# - protest_data.(xlsx|csv), bus_data.xlsx, routes_final.csv, feedback.csv
+# - 컬럼/값 형식은 data/ 원본과 동일 (앱 로더가 그대로 읽을 수 있음)
+# 사용 예) python bench/gen_synthetic.py --rows 100000 --out bench/_data/100000
+# -----------------------------------------------------------------------------
+import argparse
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 원본 데이터에서 가져온 값 풀
+LOCATIONS = [
+    "흥인지문 공원 → 교보빌딩 <종로6가 등>", "동화면세점 앞 인도 <신문로1가>",
+    "정부서울청사 정문 앞 → 적선R <적선동 등>", "교보빌딩 앞 2개 차로 → 안국R <세종대로 등>",
+    "정부서울청사 북측 인도 및 1개 차로 <적선동>", "SK서린빌딩 앞 <서린동>", "광화문KT 남측 인도 <세종대로>",
+    "광화문KT 본관 앞 <세종대로>", "광화문KT 별관 서측 <세종대로>", "외교부청사 → 우리은행 효자동점 <창천동 등>",
+    "교보빌딩 → 명동역 6出 <세종대로 등>", "SK서린빌딩 남측 → 세종R <세종대로 등>",
+    "서울역 4出 → 종3R (봉래동 등)", "혜화역 1出 → 종1R (종로 등)", "보신각 앞 <종로1가>",
+    "탑골공원 앞 인도 <종로2가>", "대학로 마로니에공원 <동숭동>", "종묘광장공원 <훈정동>",
+]
+DISTRICTS = ["종로", "남대문", "혜화", "서대문", "중부"]
+MEMOS = [
+    "보수단체", "도심순환", "특검 예산 반대", "탄핵 찬반", "공무원노조", "기후환경", "장애인 이동권", "노조",
+    "외교부", "사회단체", "시민단체", "민주의회", "정부서울청사", "대선", "위안부", "교통통제", "광복절", "",
+]
+NEWS_DOMAINS = ["www.yna.co.kr", "www.hani.co.kr", "www.chosun.com", "news.kbs.co.kr", "www.sisaweekly.com"]
+STOP_NAMES = [
+    "광화문역2번출구.KT광화문지사", "세종문화회관", "광화문", "종로1가", "종로2가", "종로3가", "종로5가",
+    "안국역", "경복궁", "서울역사박물관", "혜화역", "동대문역", "종묘", "탑골공원", "적선동",
+]
+ROUTES = [
+    "01A", "1020", "109", "1711", "606", "7016", "7018", "708", "7212", "N51", "종로09", "종로11", "401", "406",
+    "700", "7022", "704", "1002김포", "5000A용인", "5005용인", "703", "8600김포", "9000광주", "9401", "TOUR11",
+]
+FEEDBACK = [
+    "교통 통제가 너무 길어서 버스 지연이 심각합니다.", "집회 구간 안내 표지판이 적어서 시민들이 불편해합니다.",
+    "소음이 심해 인근 상가 영업에 지장이 큽니다.", "경찰 인력이 부족해 안전 관리가 미흡합니다.",
+    "집회 시간대를 좀 더 단축해주면 좋겠습니다.", "시위대 쓰레기 처리가 제대로 되지 않습니다.",
+    "버스 우회 안내를 실시간으로 더 자주 해주세요.", "집회 장소 주변에 임시 화장실 설치가 필요합니다.",
+    "응급 상황에 대비한 의료 지원 인력이 부족합니다.", "확성기 소리를 줄여주시면 감사하겠습니다.",
+    "행진 경로 안내 지도가 부족합니다.", "주민들을 위한 대체 통행로를 마련해주세요.",
+    "집회 관련 정보를 SNS로도 실시간 공유해주세요.", "비 오는 날 집회 시 안전 사고 우려가 있습니다.",
+    "집회 시작 전 미리 문자로 공지해주면 좋겠습니다.", "도로 점거 범위를 최소화해 주세요.",
+]
+START = date(2023, 1, 1)
+
+
+def _n_days(rows: int) -> int:
+    """하루 평균 ~15건이 되도록 기간 설정 (최소 1개월, 최대 5년)"""
+    return int(min(max(rows // 15, 31), 365 * 5))
+
+
+def _dates(rng, rows: int) -> pd.Series:
+    offs = rng.integers(0, _n_days(rows), rows)
+    return pd.to_datetime(START) + pd.to_timedelta(np.sort(offs), unit="D")
+
+
+def _hhmm(minutes: np.ndarray) -> np.ndarray:
+    minutes = np.clip(minutes, 0, 23 * 60 + 59)
+    return np.char.add(
+        np.char.add(np.char.zfill((minutes // 60).astype(str), 2), ":"),
+        np.char.zfill((minutes % 60).astype(str), 2),
+    )
+
+
+def make_protests(rng, rows: int) -> pd.DataFrame:
+    d = _dates(rng, rows)
+    start = rng.integers(14, 40, rows) * 30              # 07:00 ~ 19:30, 30분 단위
+    end = start + rng.integers(1, 9, rows) * 60           # 1~8시간
+    head = np.round(rng.lognormal(mean=6.0, sigma=1.4, size=rows), -1).astype(int).clip(10, 100000)
+    loc_i = rng.integers(0, len(LOCATIONS), rows)
+    dom = np.array(NEWS_DOMAINS)[rng.integers(0, len(NEWS_DOMAINS), rows)]
+    ids = rng.integers(10000, 99999, rows)
+    memo = np.array(MEMOS, dtype=object)[rng.integers(0, len(MEMOS), rows)]
+    return pd.DataFrame(
+        {
+            "src_file": d.strftime("%y%m%d") + " 인터넷집회.pdf",
+            "date": d,
+            "start_time": _hhmm(start),
+            "end_time": _hhmm(end),
+            "location": np.array(LOCATIONS, dtype=object)[loc_i],
+            "district": np.array(DISTRICTS, dtype=object)[rng.integers(0, len(DISTRICTS), rows)],
+            "reported_headcount": head,
+            "memo": np.where(memo == "", None, memo),
+            "link": ["https://" + a + "/news/articleView.html?idxno=" + str(b) for a, b in zip(dom, ids)],
+            "title": [f"{m or '도심'} 집회 관련 기사 {b}" for m, b in zip(memo, ids)],
+        }
+    )
+
+
+def make_bus(rng, rows: int) -> pd.DataFrame:
+    d = _dates(rng, rows)
+    span_days = rng.choice([0, 0, 0, 1, 2], rows)
+    ars = rng.integers(1001, 1999, rows)
+    return pd.DataFrame(
+        {
+            "start_date": d,
+            "start_time": _hhmm(rng.integers(0, 20, rows) * 60),
+            "end_date": d + pd.to_timedelta(span_days, unit="D"),
+            "end_time": "23:00",
+            "ARS_ID": ars,
+            "정류소명": np.array(STOP_NAMES, dtype=object)[ars % len(STOP_NAMES)],
+            "x좌표": 126.977 + rng.normal(0, 0.004, rows),
+            "y좌표": 37.573 + rng.normal(0, 0.003, rows),
+        }
+    )
+
+
+def make_routes(rng, rows: int) -> pd.DataFrame:
+    d = _dates(rng, rows)
+    return pd.DataFrame(
+        {
+            "date": [f"{x.month}/{x.day}/{x.year}" for x in d],
+            "ars_id": np.char.zfill(rng.integers(1001, 1999, rows).astype(str), 5),
+            "route": np.array(ROUTES, dtype=object)[rng.integers(0, len(ROUTES), rows)],
+        }
+    )
+
+
+def make_feedback(rng, rows: int, protests: pd.DataFrame) -> pd.DataFrame:
+    ev = protests.iloc[rng.integers(0, len(protests), rows)].reset_index(drop=True)
+    saved = ev["date"] + pd.to_timedelta(rng.integers(0, 86400, rows), unit="s")
+    text = np.array(FEEDBACK, dtype=object)[rng.integers(0, len(FEEDBACK), rows)]
+    return pd.DataFrame(
+        {
+            "saved_at": saved.dt.strftime("%Y-%m-%dT%H:%M:%S"),
+            "date": ev["date"].dt.strftime("%Y-%m-%d"),
+            "start": ev["start_time"],
+            "end": ev["end_time"],
+            "location": ev["location"],
+            "district": ev["district"],
+            "reported_head": ev["reported_headcount"],
+            "memo": ev["memo"],
+            "feedback": text,
+            "dupe_key": "",
+        }
+    )
+
+
+def generate(out_dir: str, rows: int, seed: int = 42, protest_format: str = "xlsx") -> dict[str, Path]:
+    """out_dir에 4개 파일을 rows행씩 생성하고 {종류: 경로}를 반환"""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    protests = make_protests(rng, rows)
+    paths = {
+        "events": out / f"protest_data.{protest_format}",
+        "bus": out / "bus_data.xlsx",
+        "routes": out / "routes_final.csv",
+        "feedback": out / "feedback.csv",
+    }
+    if protest_format == "csv":
+        protests.to_csv(paths["events"], index=False, encoding="utf-8")
+    else:
+        protests.to_excel(paths["events"], index=False)
+    make_bus(rng, rows).to_excel(paths["bus"], index=False)
+    make_routes(rng, rows).to_csv(paths["routes"], index=False, encoding="utf-8-sig")
+    make_feedback(rng, rows, protests).to_csv(paths["feedback"], index=False, encoding="utf-8-sig")
+    return paths
+
+
+def main():
+    ap = argparse.ArgumentParser(description="합성 집회/버스우회/노선/피드백 데이터 생성")
+    ap.add_argument("--rows", type=int, default=1000, help="파일별 행 수 (10^3 ~ 10^6)")
+    ap.add_argument("--out", default=None, help="출력 폴더 (기본: bench/_data/<rows>)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--protest-format", choices=["xlsx", "csv"], default="xlsx")
+    args = ap.parse_args()
+    out = args.out or str(Path(__file__).resolve().parent / "_data" / str(args.rows))
+    paths = generate(out, args.rows, seed=args.seed, protest_format=args.protest_format)
+    for k, p in paths.items():
+        print(f"{k:9s} {p}  ({p.stat().st_size / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
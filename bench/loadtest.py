@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# bench/loadtest.py
+# -----------------------------------------------------------------------------
+# 다중 세션 부하 테스트 (Streamlit AppTest, 한 프로세스 안에서 N명 동시 사용자)
+# - 사용자 흐름: 메인(월간) → 상세(일자) → 챗봇 모달 열기 → 질문 전송
+# - LLM은 llm_gateway.FakeLLM(LLM_FAKE_LATENCY)으로 대체 (OpenAI 호출 없음)
+#   --questions N: 사용자들이 N가지 질문만 보내도록 해서 게이트웨이 요청 합치기 확인
+# - 결과: 처리량(reruns/s), 단계별 p50/p95/p99 리런 지연, 프로세스 RSS
+#   RSS는 워밍업 세션 1회(임포트/데이터 로드/캐시 채움) 뒤를 기준으로 세션당 추가 비용을 계산
+# 사용 예) python bench/loadtest.py --users 20 --iterations 3 --llm-latency 0.8
+# -----------------------------------------------------------------------------
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(ROOT))
+
+from llm_gateway import FakeLLM, shared_fake  # noqa: E402
+from tracing import percentile  # noqa: E402
+
+
+def rss_mb() -> float:
+    """현재 프로세스 RSS(MB). /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def install_fake_llm(latency: float) -> FakeLLM:
+    """앱이 OpenAI 대신 llm_gateway.FakeLLM을 쓰게 함 (LLM_FAKE_LATENCY). 공용 인스턴스 반환"""
+    os.environ.setdefault("OPENAI_API_KEY", "sk-loadtest")
+    os.environ["LLM_FAKE_LATENCY"] = str(latency)
+    return shared_fake(float(os.environ["LLM_FAKE_LATENCY"]))
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: dict[str, list[float]] = {}
+        self.errors = 0
+
+    def timed_run(self, at, step: str, timeout: float):
+        t0 = time.perf_counter()
+        at.run(timeout=timeout)
+        ms = (time.perf_counter() - t0) * 1000.0
+        with self._lock:
+            self.samples.setdefault(step, []).append(ms)
+            if at.exception:
+                self.errors += 1
+
+
+def user_flow(rec: Recorder, uid: int, args, data_paths: list[str] | None):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=args.timeout)
+    rec.timed_run(at, "main", args.timeout)
+    if data_paths:
+        for w, v in zip(at.sidebar.text_input, data_paths):
+            w.set_value(v)
+        rec.timed_run(at, "main", args.timeout)
+    for it in range(args.iterations):
+        at.query_params.clear()
+        rec.timed_run(at, "main", args.timeout)
+        at.query_params["view"] = "detail"
+        at.query_params["date"] = args.date
+        at.query_params["idx"] = "0"
+        rec.timed_run(at, "detail", args.timeout)
+        at.query_params["chat"] = "open"
+        rec.timed_run(at, "chat_open", args.timeout)
+        box = [t for t in at.text_input if str(t.key).startswith("chat_input_")]
+        send = [b for b in at.button if b.label == "전송"]
+        if box and send:
+            if args.questions:
+                box[0].set_value(f"{args.date} 172번 버스 우회 알려줘 (질문 {(uid + it) % args.questions})")
+            else:
+                box[0].set_value(f"{args.date} 172번 버스 우회 알려줘 (user {uid}, #{it})")
+            send[0].click()
+            rec.timed_run(at, "chat_send", args.timeout)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Streamlit 다중 세션 부하 테스트")
+    ap.add_argument("--users", type=int, default=10, help="동시 사용자(세션) 수")
+    ap.add_argument("--iterations", type=int, default=2, help="사용자당 흐름 반복 횟수")
+    ap.add_argument("--llm-latency", type=float, default=0.5, help="가짜 LLM 응답 지연(초)")
+    ap.add_argument("--questions", type=int, default=0, help="서로 다른 질문 수 (0이면 사용자마다 모두 다름)")
+    ap.add_argument("--date", default="2025-08-15", help="상세 화면에서 볼 날짜")
+    ap.add_argument("--rows", type=int, default=None, help="bench/_data/<rows> 합성 데이터 사용")
+    ap.add_argument("--timeout", type=float, default=120.0, help="리런 1회 타임아웃(초)")
+    ap.add_argument("--out", default=None, help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    os.chdir(ROOT)  # 앱이 data/ 상대경로를 사용
+    fake_llm = install_fake_llm(args.llm_latency)
+
+    data_paths = None
+    if args.rows:
+        d = BENCH_DIR / "_data" / str(args.rows)
+        if not (d / "protest_data.xlsx").exists():
+            from gen_synthetic import generate
+            generate(str(d), args.rows)
+        data_paths = [str(d / "protest_data.xlsx"), str(d / "bus_data.xlsx"), str(d / "routes_final.csv")]
+
+    rss_start = rss_mb()
+    # 워밍업: 세션 1개로 흐름을 한 번 돌려 프로세스 고정 비용(Streamlit/앱 임포트, 데이터·캐시)을 먼저 치름
+    user_flow(Recorder(), -1, argparse.Namespace(**{**vars(args), "iterations": 1}), data_paths)
+    rss_warm = rss_mb()
+    calls_warm = fake_llm.calls
+
+    rec = Recorder()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        futures = [pool.submit(user_flow, rec, i, args, data_paths) for i in range(args.users)]
+        failed = 0
+        for f in futures:
+            try:
+                f.result()
+            except Exception as e:
+                failed += 1
+                print(f"[WARN] session failed: {e!r}")
+    wall = time.perf_counter() - t0
+    rss_end = rss_mb()
+
+    all_ms = [x for v in rec.samples.values() for x in v]
+    report = {
+        "users": args.users,
+        "iterations": args.iterations,
+        "llm_latency_s": args.llm_latency,
+        "chat_sends": len(rec.samples.get("chat_send", [])),
+        "llm_backend_calls": fake_llm.calls - calls_warm,
+        "wall_s": round(wall, 3),
+        "reruns": len(all_ms),
+        "throughput_rps": round(len(all_ms) / wall, 3) if wall else 0.0,
+        "errors": rec.errors,
+        "failed_sessions": failed,
+        "rss_start_mb": round(rss_start, 1),
+        "rss_after_warmup_mb": round(rss_warm, 1),
+        "rss_end_mb": round(rss_end, 1),
+        # 워밍업 이후 증가분만 세션 수로 나눔 (복제본 크기 = rss_after_warmup_mb + 세션 수 × 이 값)
+        "rss_marginal_per_session_mb": round((rss_end - rss_warm) / max(args.users, 1), 2),
+        "latency_ms": {
+            step: {
+                "n": len(v),
+                "p50": round(percentile(v, 0.50), 1),
+                "p95": round(percentile(v, 0.95), 1),
+                "p99": round(percentile(v, 0.99), 1),
+            }
+            for step, v in sorted({**rec.samples, "all": all_ms}.items())
+        },
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# chat_memory.py
+# -----------------------------------------------------------------------------
+# 토큰 예산 기반 대화 메모리 (챗봇 스크립트 공용)
+# - 최근 대화는 슬라이딩 윈도우로 원문 유지
+# - 윈도우 밖으로 밀려난 대화는 누적 요약(rolling summary)으로 압축
+# - 세션당 저장 메시지 수에 상한 → 긴 대화에서도 프롬프트 크기/메모리 일정
+# -----------------------------------------------------------------------------
+from typing import Callable
+
+try:
+    import tiktoken
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENC = None
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 (tiktoken이 없으면 UTF-8 바이트/3 근사치)"""
+    if not text:
+        return 0
+    if _ENC is not None:
+        return len(_ENC.encode(text, disallowed_special=()))
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """앞부분 기준으로 max_tokens 이내로 자르기 (말줄임표 한 토큰 포함)"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    keep = max(0, max_tokens - 1)
+    if _ENC is not None:
+        return _ENC.decode(_ENC.encode(text, disallowed_special=())[:keep]) + " …"
+    return text.encode("utf-8")[: keep * 3].decode("utf-8", errors="ignore") + " …"
+
+
+def _extractive_summary(prev: str, dropped: list[dict], line_tokens: int = 40) -> str:
+    """기본 요약기: 밀려난 메시지마다 앞부분 한 줄씩 남김"""
+    lines = [prev] if prev else []
+    for m in dropped:
+        who = "사용자" if m["role"] == "user" else "챗봇"
+        first = " ".join(str(m["content"]).split())
+        lines.append(f"- {who}: {truncate_tokens(first, line_tokens)}")
+    return "\n".join(lines)
+
+
+class ConversationMemory:
+    """토큰 예산이 있는 대화 메모리.
+
+    - messages: 화면 표시용 최근 메시지 (최대 max_stored개)
+    - prompt_messages(): 요약(system) + 예산 안에 들어가는 최근 윈도우만 반환
+    - reserve_for_extra: 첨부(extra)에 먼저 떼어 두는 토큰 수 (윈도우는 나머지 안에서 자름)
+    - summarize(prev_summary, dropped_messages) -> str 로 요약 방식을 교체 가능 (기본: 추출식)
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        window_turns: int = 6,
+        max_stored: int = 40,
+        summary_tokens: int = 400,
+        reserve_for_extra: int = 800,
+        summarize: Callable[[str, list[dict]], str] | None = None,
+    ):
+        self.max_tokens = max_tokens
+        self.window_turns = window_turns
+        self.max_stored = max_stored
+        self.summary_tokens = summary_tokens
+        self.reserve_for_extra = reserve_for_extra
+        self.summarize = summarize or _extractive_summary
+        self.messages: list[dict] = []
+        self.summary = ""
+        self._summarized = 0  # messages 중 이미 요약에 반영된 앞쪽 개수
+
+    def add(self, role: str, content: str) -> None:
+        self.messages.append({"role": role, "content": content})
+        self._compact()
+
+    def _window_start(self) -> int:
+        """윈도우(최근 window_turns턴 = 2*window_turns 메시지)의 시작 인덱스"""
+        return max(0, len(self.messages) - 2 * self.window_turns)
+
+    def _compact(self) -> None:
+        start = self._window_start()
+        if start > self._summarized:
+            dropped = self.messages[self._summarized:start]
+            self.summary = self._trim_summary(self.summarize(self.summary, dropped))
+            self._summarized = start
+        # 저장 상한: 요약에 이미 반영된 오래된 메시지부터 버림
+        overflow = len(self.messages) - self.max_stored
+        if overflow > 0:
+            cut = min(overflow, self._summarized)
+            del self.messages[:cut]
+            self._summarized -= cut
+
+    def _trim_summary(self, text: str) -> str:
+        # 요약도 예산 초과 시 오래된 줄부터 제거 (최근 맥락 우선)
+        lines = text.split("\n")
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > self.summary_tokens:
+            lines.pop(0)
+        return truncate_tokens("\n".join(lines), self.summary_tokens)
+
+    def prompt_messages(self, system: str | None = None, extra: str | None = None) -> list[dict]:
+        """API 전송용 메시지 목록.
+
+        system: 시스템 프롬프트, extra: 이번 질문에만 붙일 첨부(예: OCR 텍스트, 예산에 맞게 잘림).
+        """
+        head = []
+        if system:
+            head.append({"role": "system", "content": system})
+        if self.summary:
+            head.append({"role": "system", "content": "이전 대화 요약:\n" + self.summary})
+        budget = max(0, self.max_tokens - sum(count_tokens(m["content"]) for m in head))
+        window = [dict(m) for m in self.messages[self._summarized:]]
+        tag = "\n\n[첨부파일 내용]\n"
+        attach = bool(extra and window and window[-1]["role"] == "user")
+        # 첨부 자리를 먼저 떼어 두고, 윈도우는 나머지 예산 안에서 자름
+        reserve = min(self.reserve_for_extra, count_tokens(tag + extra), budget) if attach else 0
+        limit = budget - reserve
+        if window:
+            # 마지막 질문 자체도 예산을 넘지 않도록 자름
+            window[-1]["content"] = truncate_tokens(window[-1]["content"], limit)
+        # 예산 초과 시 가장 오래된 메시지부터 제외 (마지막 질문은 항상 유지)
+        while len(window) > 1 and sum(count_tokens(m["content"]) for m in window) > limit:
+            window.pop(0)
+        if attach:
+            room = budget - sum(count_tokens(m["content"]) for m in window) - count_tokens(tag)
+            if room > 0:
+                window[-1]["content"] += tag + truncate_tokens(extra, room)
+        return head + window
@@ -0,0 +1,711 @@
+# -*- coding: utf-8 -*-
+# data_core.py
+# -----------------------------------------------------------------------------
+# 데이터 로드/가공 공용 모듈 (Streamlit 비의존)
+# - 집회/버스 우회/노선/피드백 로더, 일자 필터, 캘린더 도트 변환
+# - 워드클라우드용 토크나이즈, 뉴스 링크 헬퍼
+# - app.py는 이 함수들을 st.cache_data로 감싸 사용, 벤치마크/배치 스크립트는 직접 import
+# -----------------------------------------------------------------------------
+import re
+from pathlib import Path
+from datetime import date
+from collections import Counter
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+# Wordcloud (선택)
+try:
+    from wordcloud import WordCloud
+    WORDCLOUD_AVAILABLE = True
+except Exception:
+    WORDCLOUD_AVAILABLE = False
+
+
+# ====================== 1) 데이터 로드 함수 ================================
+# 로더는 컴팩트 스키마로 반환 (st.cache_data 피클/복사 비용 최소화)
+# - 날짜: int32 일 번호(1970-01-01 기준), 시각: int16 분(0~1439)
+# - 반복 문자열(장소/관할서/정류소/노선 등): category
+# - 신고인원: 집계용 Int32(_head) + 표시용 원문 category(_head_text)
+# 화면용 원래 컬럼(_date, _start, start_date, date 등)은 filter_by_day /
+# get_bus_rows_for_date / routes_for_date가 잘라낸 일부 행에 대해서만 복원
+_EPOCH_ORD = date(1970, 1, 1).toordinal()
+DAY_NA = np.iinfo(np.int32).min
+MIN_NA = np.iinfo(np.int16).min
+
+def day_num(d: date) -> int:
+    return d.toordinal() - _EPOCH_ORD
+
+def day_to_date(n) -> date:
+    return date.fromordinal(int(n) + _EPOCH_ORD)
+
+def min_to_hhmm(m) -> str:
+    m = int(m)
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+def to_date(x):
+    if pd.isna(x):
+        return None
+    s = str(x).strip()
+    if re.match(r"^\d{4}\.\d{1,2}\.\d{1,2}$", s):
+        s = s.replace(".", "-")
+    try:
+        return parser.parse(s).date()
+    except Exception:
+        return None
+
+def to_minute(x):
+    if pd.isna(x):
+        return None
+    try:
+        t = parser.parse(str(x)).time()
+        return t.hour * 60 + t.minute
+    except Exception:
+        return None
+
+def _encode_unique(series: pd.Series, fn, dtype, na) -> np.ndarray:
+    """고유값만 한 번씩 파싱해서 코드 배열로 변환 (날짜/시각은 반복이 많음)"""
+    codes, uniques = pd.factorize(series)
+    vals = [fn(u) for u in uniques]
+    table = np.array([na if v is None else v for v in vals] + [na], dtype=dtype)
+    return table[codes]  # 결측(code -1)은 마지막 na로 매핑
+
+def _day_of(x):
+    d = to_date(x)
+    return None if d is None else day_num(d)
+
+def day_codes(series: pd.Series) -> np.ndarray:
+    return _encode_unique(series, _day_of, np.int32, DAY_NA)
+
+def minute_codes(series: pd.Series) -> np.ndarray:
+    return _encode_unique(series, to_minute, np.int16, MIN_NA)
+
+def headcount_codes(series: pd.Series) -> pd.Series:
+    """신고인원 → Int32. '1,200', '약 300명', '300~500명'처럼 숫자가 아니면 첫 숫자 사용 (없으면 결측)"""
+    num = pd.to_numeric(series, errors="coerce").astype("float64")
+    miss = num.isna() & series.notna()
+    if miss.any():
+        first = series[miss].astype(str).str.extract(r"(\d[\d,]*(?:\.\d+)?)", expand=False)
+        num[miss] = pd.to_numeric(first.str.replace(",", "", regex=False), errors="coerce")
+    return num.round().astype("Int32")
+
+def headcount_text(series: pd.Series) -> pd.Categorical:
+    """신고인원 표시용 원문 category.
+    빈 칸 때문에 float로 읽힌 정수('300.0')는 '300'으로 → 일괄 로드(타입 추론)와 스트리밍(문자열)이 같은 값"""
+    text = series.astype(str).str.replace(r"^(-?\d+)\.0+$", r"\1", regex=True)
+    return pd.Categorical(text)
+
+def _require_file(path: str) -> Path:
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"파일을 찾을 수 없습니다: {path}")
+    return p
+
+EVENT_VARIANTS = {
+    "date": ["date", "날짜"],
+    "start_time": ["start_time", "start", "시작", "starttime"],
+    "end_time": ["end_time", "end", "종료", "endtime"],
+    "location": ["location", "장소", "place"],
+    "district": ["district", "관할서", "구"],
+    "reported_head": ["reported_head", "reported_headcount", "신고인원", "인원"],
+    "memo": ["memo", "비고", "메모"],
+    "link": ["link", "news_link", "기사링크"],
+    "title": ["title", "news_title", "기사제목"],
+}
+
+def resolve_event_columns(columns) -> dict:
+    """원본 컬럼명 → 표준 키 매핑 (필수 컬럼 없으면 ValueError)"""
+    def find_col(k):
+        for cand in EVENT_VARIANTS[k]:
+            for c in columns:
+                if str(c).strip().lower() == cand.lower():
+                    return c
+        return None
+    col = {k: find_col(k) for k in EVENT_VARIANTS}
+    for k in ["date", "start_time", "end_time", "location"]:
+        if col[k] is None:
+            raise ValueError(f"'{k}' 컬럼이 필요합니다.")
+    return col
+
+def normalize_events(df: pd.DataFrame, col: dict | None = None) -> pd.DataFrame:
+    """원본 집회 프레임 → 컴팩트 표준 프레임"""
+    col = col or resolve_event_columns(df.columns)
+    n = len(df)
+    def opt(k):
+        return df[col[k]] if col[k] else pd.Series([""] * n, index=df.index)
+    out = pd.DataFrame(
+        {
+            "_day": day_codes(df[col["date"]]),
+            "_start_min": minute_codes(df[col["start_time"]]),
+            "_end_min": minute_codes(df[col["end_time"]]),
+            "_loc": pd.Categorical(df[col["location"]].astype(str)),
+            "_dist": pd.Categorical(opt("district").astype(str)),
+            "_head": headcount_codes(opt("reported_head")),
+            "_head_text": headcount_text(opt("reported_head")),  # 화면 표시용 원문
+            "_memo": pd.Categorical(opt("memo").astype(str)),
+            "__link": opt("link").to_numpy(dtype=object),
+            "__title": opt("title").to_numpy(dtype=object),
+        }
+    )
+    ok = (out["_day"] != DAY_NA) & (out["_start_min"] != MIN_NA) & (out["_end_min"] != MIN_NA)
+    return out[ok].reset_index(drop=True)
+
+def load_events(path: str) -> pd.DataFrame:
+    """집회 데이터 로드 + 표준화 컬럼 생성"""
+    p = _require_file(path)
+    if _should_stream(p):
+        return load_events_stream(path)
+    if p.suffix.lower() in XLSX_SUFFIXES | {".xls"}:
+        df = pd.read_excel(p)
+    else:
+        df = pd.read_csv(p, encoding="utf-8")
+    return normalize_events(df)
+
+BUS_VARIANTS = {
+    "start_date": ("start_date", "시작일"),
+    "start_time": ("start_time", "시작시간"),
+    "end_date": ("end_date", "종료일"),
+    "end_time": ("end_time", "종료시간"),
+    "ars": ("ars_id", "ars", "정류장id"),
+    "name": ("정류소명", "정류장명", "stop_name"),
+    "x": ("x좌표", "x", "lon", "lng"),
+    "y": ("y좌표", "y", "lat"),
+}
+
+def resolve_bus_columns(columns) -> dict | None:
+    """원본 컬럼명 → 표준 키 매핑 (하나라도 없으면 None)"""
+    cols = {c: str(c).strip().lower() for c in columns}
+    def pick(*names):
+        for n in names:
+            for c, lc in cols.items():
+                if lc == n:
+                    return c
+        return None
+    col = {k: pick(*names) for k, names in BUS_VARIANTS.items()}
+    return None if any(c is None for c in col.values()) else col
+
+def normalize_bus(df: pd.DataFrame, col: dict | None = None) -> pd.DataFrame:
+    """원본 버스 우회 프레임 → 컴팩트 표준 프레임 (필수 컬럼 없으면 빈 프레임)"""
+    col = col or resolve_bus_columns(df.columns)
+    if col is None:
+        return pd.DataFrame()
+    ars = df[col["ars"]].astype(str).str.replace(r"\D", "", regex=True).str.zfill(5)
+    out = pd.DataFrame(
+        {
+            "start_day": day_codes(df[col["start_date"]]),
+            "start_min": minute_codes(df[col["start_time"]]),
+            "end_day": day_codes(df[col["end_date"]]),
+            "end_min": minute_codes(df[col["end_time"]]),
+            "ARS_ID": pd.Categorical(ars),
+            "정류소명": pd.Categorical(df[col["name"]].astype(str)),
+            "lon": pd.to_numeric(df[col["x"]], errors="coerce").astype(np.float32),
+            "lat": pd.to_numeric(df[col["y"]], errors="coerce").astype(np.float32),
+        }
+    )
+    ok = (out["start_day"] != DAY_NA) & (out["end_day"] != DAY_NA) & out["lon"].notna() & out["lat"].notna()
+    return out[ok].reset_index(drop=True)
+
+def load_bus(path: str) -> pd.DataFrame:
+    """버스 우회 데이터 로드"""
+    p = Path(path)
+    if not p.exists():
+        return pd.DataFrame()
+    if _should_stream(p):
+        return load_bus_stream(path)
+    return normalize_bus(pd.read_excel(p))
+
+ROUTE_COLUMNS = ["day", "ars_id", "route"]
+ROUTE_DTYPES = {"ars_id": str, "route": str}
+
+def normalize_routes(df: pd.DataFrame) -> pd.DataFrame:
+    """원본 노선 매핑 프레임 → 컴팩트 표준 프레임"""
+    out = pd.DataFrame(
+        {
+            "day": day_codes(df["date"]),
+            "ars_id": pd.Categorical(df["ars_id"].astype(str).str.replace(r"\D", "", regex=True).str.zfill(5)),
+            "route": pd.Categorical(df["route"].fillna("").astype(str).str.strip()),
+        }
+    )
+    return out[out["day"] != DAY_NA].reset_index(drop=True)
+
+def load_routes(path: str) -> pd.DataFrame:
+    """노선-정류장 매핑 CSV 로드"""
+    p = Path(path)
+    if not p.exists():
+        return pd.DataFrame(columns=ROUTE_COLUMNS)
+    if _should_stream(p):
+        return load_routes_stream(path)
+    return normalize_routes(pd.read_csv(p, dtype=ROUTE_DTYPES))
+
+
+# ====================== 1-1) 스트리밍 로더 (대용량 다년치 파일) ==================
+# - CSV는 chunksize 단위, XLSX는 openpyxl read-only 행 이터레이터로 읽음
+#   (원본 바이트 + 파서 상태 + 전체 원본 프레임을 동시에 들고 있지 않음)
+# - 컬럼 매핑은 첫 청크에서 한 번만 → 청크마다 normalize_* + 기간 필터
+# - 결과는 미리 잡아 둔 컴팩트 배열(_CompactBuilder)에 이어 붙임
+# 파일이 STREAM_MIN_BYTES 이상이면 load_events/load_bus/load_routes가 자동으로 사용
+# - 구형 .xls는 openpyxl로 행 단위 읽기가 안 되므로 자동 전환하지 않음 (기존 read_excel 경로)
+STREAM_MIN_BYTES = 32 * 1024 * 1024
+XLSX_SUFFIXES = {".xlsx", ".xlsm"}
+STREAM_CHUNK_ROWS = 50_000
+# pandas read_excel/read_csv 기본 결측 문자열과 동일하게 취급
+_NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+def _xlsx_cell(v):
+    # read_excel과 같은 값이 나오도록: 빈 칸/결측 문자열 → NaN, 정수형 float → int
+    if v is None or (isinstance(v, str) and v in _NA_STRINGS):
+        return np.nan
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+def _xlsx_chunks(path: Path, chunksize: int):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [f"Unnamed: {i}" if h is None else h for i, h in enumerate(header)]
+        width, buf = len(header), []
+        for r in rows:
+            if all(v is None for v in r):
+                continue
+            r = list(r[:width]) + [None] * (width - len(r))
+            buf.append([_xlsx_cell(v) for v in r])
+            if len(buf) >= chunksize:
+                yield pd.DataFrame(buf, columns=header)
+                buf = []
+        if buf:
+            yield pd.DataFrame(buf, columns=header)
+    finally:
+        wb.close()
+
+def _should_stream(p: Path) -> bool:
+    return p.suffix.lower() != ".xls" and p.stat().st_size >= STREAM_MIN_BYTES
+
+def iter_raw_chunks(path: str, chunksize: int = STREAM_CHUNK_ROWS, csv_dtype=None):
+    """원본 파일 → 원본 프레임 청크 제너레이터 (xlsx/xlsm은 행 단위, 그 외는 CSV)
+    .xls는 행 단위로 읽을 수 없어 read_excel로 한 번에 읽은 뒤 잘라서 돌려줌 (메모리 절감 없음)"""
+    p = _require_file(path)
+    suffix = p.suffix.lower()
+    if suffix in XLSX_SUFFIXES:
+        yield from _xlsx_chunks(p, chunksize)
+    elif suffix == ".xls":
+        df = pd.read_excel(p)
+        for i in range(0, len(df), chunksize):
+            yield df.iloc[i:i + chunksize]
+    else:
+        with pd.read_csv(p, encoding="utf-8", chunksize=chunksize, dtype=csv_dtype) as reader:
+            yield from reader
+
+def _estimate_rows(path: str) -> int:
+    """배열 선할당용 행 수 추정 (xlsx는 시트 크기, CSV는 앞부분 64KB의 줄 밀도, xls는 모름)"""
+    p = Path(path)
+    try:
+        if p.suffix.lower() == ".xls":
+            return 0
+        if p.suffix.lower() in XLSX_SUFFIXES:
+            from openpyxl import load_workbook
+
+            wb = load_workbook(p, read_only=True)
+            try:
+                return max(int(wb.worksheets[0].max_row or 0) - 1, 0)
+            finally:
+                wb.close()
+        with open(p, "rb") as f:
+            head = f.read(65536)
+        lines = max(head.count(b"\n"), 1)
+        return int(p.stat().st_size / len(head) * lines * 1.05) if head else 0
+    except Exception:
+        return 0
+
+class _CompactBuilder:
+    """청크별 컴팩트 프레임을 미리 할당한 컬럼 배열에 이어 붙임 (모자라면 2배 확장)
+    - category 컬럼은 전역 카테고리 사전 + int32 코드로 누적 (문자열 배열을 합치지 않음)
+    - Int32(결측 허용) 컬럼은 값/마스크 배열로 누적"""
+
+    def __init__(self, capacity: int):
+        self.cap = max(int(capacity), 1024)
+        self.n = 0
+        self.template = None
+        self.arrays: dict[str, np.ndarray] = {}
+        self.masks: dict[str, np.ndarray] = {}
+        self.cats: dict[str, dict] = {}
+
+    def _alloc(self, part: pd.DataFrame) -> None:
+        self.template = part.iloc[:0]
+        for c, dt in part.dtypes.items():
+            if isinstance(dt, pd.CategoricalDtype):
+                self.arrays[c] = np.empty(self.cap, dtype=np.int32)
+                self.cats[c] = {}
+            elif isinstance(dt, pd.Int32Dtype):
+                self.arrays[c] = np.empty(self.cap, dtype=np.int32)
+                self.masks[c] = np.empty(self.cap, dtype=bool)
+            elif isinstance(dt, np.dtype):
+                self.arrays[c] = np.empty(self.cap, dtype=dt)
+            else:  # 문자열 등 기타 확장 타입은 object로 모았다가 마지막에 원래 타입으로
+                self.arrays[c] = np.empty(self.cap, dtype=object)
+
+    def _grow(self, need: int) -> None:
+        cap = self.cap
+        while cap < need:
+            cap *= 2
+        for store in (self.arrays, self.masks):
+            for c, a in store.items():
+                b = np.empty(cap, dtype=a.dtype)
+                b[: self.n] = a[: self.n]
+                store[c] = b
+        self.cap = cap
+
+    def append(self, part: pd.DataFrame) -> None:
+        if self.template is None:
+            self._alloc(part)
+        m = len(part)
+        if m == 0:
+            return
+        if self.n + m > self.cap:
+            self._grow(self.n + m)
+        lo, hi = self.n, self.n + m
+        for c in self.template.columns:
+            s = part[c]
+            if c in self.cats:
+                table = self.cats[c]
+                lookup = [table.setdefault(v, len(table)) for v in s.cat.categories] + [-1]
+                self.arrays[c][lo:hi] = np.array(lookup, dtype=np.int32)[s.cat.codes.to_numpy()]  # 결측(-1) 유지
+            elif c in self.masks:
+                self.masks[c][lo:hi] = s.isna().to_numpy()
+                self.arrays[c][lo:hi] = s.to_numpy(dtype=np.int32, na_value=0)
+            else:
+                self.arrays[c][lo:hi] = s.to_numpy(dtype=self.arrays[c].dtype)
+        self.n = hi
+
+    def finish(self) -> pd.DataFrame:
+        if self.template is None:
+            return pd.DataFrame()
+        n, cols = self.n, {}
+        for c in self.template.columns:
+            if c in self.cats:
+                cats = pd.Index(list(self.cats[c]), dtype=self.template[c].dtype.categories.dtype)
+                cat = pd.Categorical.from_codes(self.arrays[c][:n], categories=cats)
+                # 일괄 로더(pd.Categorical)와 같은 정렬된 카테고리 순서로 맞춤 (정렬 키로 쓰임)
+                cols[c] = cat.reorder_categories(cats.sort_values())
+            elif c in self.masks:
+                cols[c] = pd.arrays.IntegerArray(self.arrays[c][:n].copy(), self.masks[c][:n].copy())
+            else:
+                cols[c] = pd.array(self.arrays[c][:n], dtype=self.template[c].dtype)
+        self.arrays.clear()
+        self.masks.clear()
+        return pd.DataFrame(cols)
+
+def _stream(path: str, chunksize: int, resolve, normalize, keep=None, csv_dtype=None) -> pd.DataFrame:
+    builder, col = None, None
+    for raw in iter_raw_chunks(path, chunksize, csv_dtype=csv_dtype):
+        if builder is None:
+            col = resolve(raw.columns)  # 컬럼 매핑은 파일당 한 번
+            if col is None:
+                return pd.DataFrame()
+            builder = _CompactBuilder(_estimate_rows(path))
+        part = normalize(raw, col)
+        del raw
+        if keep is not None:
+            part = part[keep(part)]
+        builder.append(part)
+    return builder.finish() if builder is not None else pd.DataFrame()
+
+def _day_range(days) -> tuple[int, int] | None:
+    if days is None:
+        return None
+    lo, hi = days
+    return (DAY_NA + 1 if lo is None else day_num(lo), np.iinfo(np.int32).max if hi is None else day_num(hi))
+
+def load_events_stream(path: str, chunksize: int = STREAM_CHUNK_ROWS, days=None) -> pd.DataFrame:
+    """집회 데이터 스트리밍 로드. days=(시작일, 종료일)이면 그 기간 행만 남김 (None은 열린 구간)"""
+    rng = _day_range(days)
+    keep = None if rng is None else (lambda f: (f["_day"] >= rng[0]) & (f["_day"] <= rng[1]))
+    # CSV는 청크마다 타입 추론이 달라지지 않도록 문자열로 읽고 normalize에서 변환
+    return _stream(path, chunksize, resolve_event_columns, normalize_events, keep, csv_dtype=str)
+
+def load_bus_stream(path: str, chunksize: int = STREAM_CHUNK_ROWS, days=None) -> pd.DataFrame:
+    """버스 우회 데이터 스트리밍 로드. days가 있으면 기간이 겹치는 우회만 남김"""
+    if not Path(path).exists():
+        return pd.DataFrame()
+    rng = _day_range(days)
+    keep = None if rng is None else (lambda f: (f["start_day"] <= rng[1]) & (f["end_day"] >= rng[0]))
+    return _stream(path, chunksize, resolve_bus_columns, normalize_bus, keep, csv_dtype=str)
+
+def load_routes_stream(path: str, chunksize: int = STREAM_CHUNK_ROWS, days=None) -> pd.DataFrame:
+    """노선 매핑 CSV 스트리밍 로드"""
+    if not Path(path).exists():
+        return pd.DataFrame(columns=ROUTE_COLUMNS)
+    rng = _day_range(days)
+    keep = None if rng is None else (lambda f: (f["day"] >= rng[0]) & (f["day"] <= rng[1]))
+    out = _stream(path, chunksize, lambda cols: True, lambda df, _: normalize_routes(df), keep, csv_dtype=ROUTE_DTYPES)
+    return out if len(out.columns) else pd.DataFrame(columns=ROUTE_COLUMNS)
+
+
+# ====================== 2) 공용 유틸 (캘린더/색상/토크나이즈/워드클라우드) =======
+def color_by_headcount(h):
+    try:
+        n = int(h)
+        if n >= 1000:
+            return "#ef4444"
+        if n >= 500:
+            return "#f59e0b"
+        return "#3b82f6"
+    except Exception:
+        return "#3b82f6"
+
+def df_to_month_dots(df: pd.DataFrame):
+    """FullCalendar용 월간 도트 이벤트 (+ 클릭 식별용 extendedProps 포함)"""
+    events = []
+    iso_cache: dict[int, str] = {}
+    for day, s_min, e_min, loc, head in zip(
+        df["_day"].to_numpy(), df["_start_min"].to_numpy(), df["_end_min"].to_numpy(), df["_loc"], df["_head"]
+    ):
+        d_iso = iso_cache.get(day)
+        if d_iso is None:
+            d_iso = iso_cache[day] = day_to_date(day).isoformat()
+        stt, edt = min_to_hhmm(s_min), min_to_hhmm(e_min)
+        events.append(
+            {
+                "title": "",
+                "start": f"{d_iso}T{stt}:00",
+                "end": f"{d_iso}T{edt}:00",
+                "display": "list-item",
+                "color": color_by_headcount(head),
+                "extendedProps": {
+                    "d": d_iso,
+                    "st": stt,
+                    "ed": edt,
+                    "loc": loc,
+                },
+            }
+        )
+    return events
+
+def decode_events(df: pd.DataFrame) -> pd.DataFrame:
+    """컴팩트 집회 행 → 화면용 컬럼(_date, _start, _end, 문자열 _loc 등) 추가"""
+    cols = {c: df[c].to_numpy() for c in df.columns}
+    cols["_date"] = np.array([day_to_date(x) for x in cols["_day"]], dtype=object)
+    cols["_start"] = np.array([min_to_hhmm(x) for x in cols["_start_min"]], dtype=object)
+    cols["_end"] = np.array([min_to_hhmm(x) for x in cols["_end_min"]], dtype=object)
+    for c in ["_loc", "_dist", "_memo", "_head", "_head_text"]:
+        cols[c] = np.asarray(df[c], dtype=object)
+    return pd.DataFrame(cols, index=df.index)
+
+def filter_by_day(df: pd.DataFrame, d: date) -> pd.DataFrame:
+    day = df[df["_day"] == day_num(d)].sort_values(by=["_start_min", "_end_min", "_loc"])
+    return decode_events(day)
+
+def decode_bus(df: pd.DataFrame) -> pd.DataFrame:
+    """컴팩트 버스 우회 행 → 화면용 컬럼(start_date, start_time, 문자열 ARS_ID 등)"""
+    def hhmm(arr):
+        return np.array([None if x == MIN_NA else min_to_hhmm(x) for x in arr], dtype=object)
+    return pd.DataFrame(
+        {
+            "start_date": np.array([day_to_date(x) for x in df["start_day"].to_numpy()], dtype=object),
+            "start_time": hhmm(df["start_min"].to_numpy()),
+            "end_date": np.array([day_to_date(x) for x in df["end_day"].to_numpy()], dtype=object),
+            "end_time": hhmm(df["end_min"].to_numpy()),
+            "ARS_ID": np.asarray(df["ARS_ID"], dtype=object),
+            "정류소명": np.asarray(df["정류소명"], dtype=object),
+            "lon": df["lon"].to_numpy(dtype=np.float64),
+            "lat": df["lat"].to_numpy(dtype=np.float64),
+        },
+        index=df.index,
+    )
+
+def get_bus_rows_for_date(bus_df: pd.DataFrame, d: date) -> pd.DataFrame:
+    if bus_df is None or bus_df.empty:
+        return pd.DataFrame()
+    n = day_num(d)
+    return decode_bus(bus_df[(bus_df["start_day"] <= n) & (bus_df["end_day"] >= n)])
+
+def routes_for_date(routes_df: pd.DataFrame, d: date) -> pd.DataFrame:
+    """해당 날짜의 (date, ars_id, route) 문자열 행"""
+    if routes_df is None or routes_df.empty:
+        return pd.DataFrame()
+    rows = routes_df[routes_df["day"] == day_num(d)]
+    return pd.DataFrame(
+        {"date": d, "ars_id": rows["ars_id"].astype(str), "route": rows["route"].astype(str)}, index=rows.index
+    )
+
+def bus_rows_with_routes(bus_df: pd.DataFrame, routes_df: pd.DataFrame, d: date) -> pd.DataFrame:
+    """해당 날짜 우회 정류소 + 정류소별 경유 노선 문자열("노선" 컬럼, 예: "109, 7016")"""
+    bus_rows = get_bus_rows_for_date(bus_df, d)
+    if bus_rows.empty:
+        return bus_rows
+    route_slice = routes_for_date(routes_df, d)
+    if not route_slice.empty:
+        agg = (
+            route_slice.dropna(subset=["ars_id", "route"])
+            .groupby("ars_id")["route"]
+            .apply(lambda s: ", ".join(sorted(set(s))))
+        ).rename("노선")
+        bus_rows = bus_rows.merge(agg, left_on="ARS_ID", right_index=True, how="left")
+    else:
+        bus_rows["노선"] = ""
+    return bus_rows
+
+# --- 워드클라우드 전처리 ---
+_STOPWORDS = {
+    "그리고","그러나","하지만","또는","및","때문","때문에","대한","관련","대해",
+    "여러분","정도","부분","등","좀","너무","수","것","거","이것","저것","우리",
+    "입니다","합니다","하는","있는","되는","됩니다","드립니다","해주시면","해주십시오",
+    "해주세요","부탁드립니다","같습니다","감사합니다","감사하겠습니다","불편합니다",
+    "입니다만","않습니다","않아요","않구요","됩니다만",
+    "으로","로","에서","에게","에는","에","의","을","를","이","가","와","과","도","만","보다",
+}
+_SUFFIX_PAT = re.compile(
+    r"(입니다|합니다|십시오|해주세요|해주시기|해주시길|해주시면|해주십시오|"
+    r"되겠습니다|되었습|되었으면|되면|되어|되었습니다|되는데|않습니다|않아요|"
+    r"같습니다|하겠습니다|부탁드립니다|감사합니다|감사하겠습니다|해요|했어요|합니다만)$"
+)
+def strip_suffix(tok: str) -> str:
+    return re.sub(_SUFFIX_PAT, "", tok)
+def tokenize_ko(s: str):
+    if not isinstance(s, str):
+        return []
+    cand = re.findall(r"[가-힣A-Za-z0-9]+", s)
+    out = []
+    for t in cand:
+        t = strip_suffix(t)
+        if len(t) < 2:
+            continue
+        if t in _STOPWORDS:
+            continue
+        out.append(t)
+    return out
+def make_bigrams(tokens, join_str=" "):
+    return [join_str.join(p) for p in zip(tokens, tokens[1:])]
+def build_wordcloud_image(
+    fb_df, date_filter=None, use_bigrams=False, font_path="data/Nanum_Gothic/NanumGothic-Regular.ttf",
+    rep_mask=None,
+):
+    """rep_mask: 유사 중복 묶음의 대표 행만 세도록 하는 bool 배열 (FeedbackDeduper.representative_mask())"""
+    if not WORDCLOUD_AVAILABLE:
+        return None
+    if fb_df is None or fb_df.empty or "feedback" not in fb_df.columns:
+        return None
+    df = fb_df.copy()
+    if rep_mask is not None and len(rep_mask) == len(df):
+        df = df[np.asarray(rep_mask, dtype=bool)]
+    if date_filter is not None and "date" in df.columns:
+        df = df[df["date"].astype(str) == str(date_filter)]
+    texts = df["feedback"].dropna().astype(str).tolist()
+    if not texts:
+        return None
+    counter = Counter()
+    for t in texts:
+        toks = tokenize_ko(t)
+        if use_bigrams:
+            toks = make_bigrams(toks)
+        counter.update(toks)
+    if not counter:
+        return None
+    fp = font_path if Path(font_path).exists() else None
+    from wordcloud import WordCloud as _WC
+    wc = _WC(font_path=fp, width=1200, height=600, background_color="white", colormap="tab20c")
+    return wc.generate_from_frequencies(counter).to_image()
+def load_feedback(path="data/feedback.csv"):
+    p = Path(path)
+    if not p.exists():
+        return pd.DataFrame()
+    try:
+        return pd.read_csv(p)
+    except Exception:
+        return pd.DataFrame()
+
+
+# ====================== 3) 뉴스 링크 헬퍼 ================================
+URL_RE = re.compile(r"https?://[^\s,]+", re.I)
+def _first_url(s: str) -> str | None:
+    if not isinstance(s, str):
+        return None
+    m = URL_RE.findall(s)
+    return m[0] if m else None
+def _domain(u: str) -> str:
+    try:
+        h = urlparse(u).netloc
+        return h.replace("www.", "")
+    except Exception:
+        return ""
+
+
+# ====================== 4) JSON 페이로드 (API/정적 내보내기 공용) =============
+def _clean(v):
+    """NaN/None/'nan' → None, numpy 스칼라 → 파이썬 값"""
+    if v is None or (not isinstance(v, str) and pd.isna(v)):
+        return None
+    if isinstance(v, str):
+        v = v.strip()
+        return None if v in ("", "nan", "None") else v
+    return v.item() if hasattr(v, "item") else v
+
+def events_payload(df: pd.DataFrame, d: date, day_df: pd.DataFrame | None = None) -> list[dict]:
+    """해당 날짜 집회 목록 (idx는 상세 화면 ?idx= 와 같은 순서). day_df: 이미 구한 filter_by_day 결과"""
+    out = []
+    day_df = filter_by_day(df, d) if day_df is None else day_df
+    for i, r in enumerate(day_df.to_dict("records")):
+        head = _clean(r["_head"])
+        out.append(
+            {
+                "idx": i,
+                "date": d.isoformat(),
+                "start": r["_start"],
+                "end": r["_end"],
+                "location": _clean(r["_loc"]),
+                "district": _clean(r["_dist"]),
+                "reported_head": int(head) if head is not None else None,
+                "memo": _clean(r["_memo"]),
+                "link": _first_url(str(r["__link"])),
+                "title": _clean(r["__title"]),
+            }
+        )
+    return out
+
+def detours_payload(bus_df: pd.DataFrame, routes_df: pd.DataFrame, d: date, rows: pd.DataFrame | None = None) -> list[dict]:
+    """해당 날짜 우회 정류소 목록 (+ 경유 노선). rows: 이미 구한 bus_rows_with_routes 결과"""
+    rows = bus_rows_with_routes(bus_df, routes_df, d) if rows is None else rows
+    out = []
+    for r in rows.to_dict("records"):
+        routes = _clean(r.get("노선"))
+        out.append(
+            {
+                "ars_id": r["ARS_ID"],
+                "name": r["정류소명"],
+                "routes": routes.split(", ") if routes else [],
+                "start": f"{r['start_date']}T{r['start_time'] or '00:00'}",
+                "end": f"{r['end_date']}T{r['end_time'] or '23:59'}",
+                "lat": round(float(r["lat"]), 6),
+                "lon": round(float(r["lon"]), 6),
+            }
+        )
+    return out
+
+def route_payload(routes_df: pd.DataFrame, bus_df: pd.DataFrame, route: str) -> dict:
+    """노선 하나의 우회 날짜별 정류소 목록"""
+    if routes_df is None or routes_df.empty:
+        return {"route": route, "dates": []}
+    rows = routes_df[routes_df["route"] == route]
+    names = {}
+    if bus_df is not None and not bus_df.empty:
+        names = dict(zip(bus_df["ARS_ID"].astype(str), bus_df["정류소명"].astype(str)))
+    dates = []
+    for day, g in rows.groupby("day", sort=True):
+        stops = sorted(set(g["ars_id"].astype(str)))
+        dates.append(
+            {
+                "date": day_to_date(day).isoformat(),
+                "stops": [{"ars_id": a, "name": names.get(a)} for a in stops],
+            }
+        )
+    return {"route": route, "dates": dates}
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+# data_watch.py
+# -----------------------------------------------------------------------------
+# 데이터 파일 버전 레지스트리 + 파일 감시 스레드
+# - 소스(파일/디렉터리)별 버전 번호 관리 → 변경된 소스만 새 버전 번호
+# - 감시: watchdog(inotify/FSEvents 등) 사용 가능 시 이벤트 기반,
+#         폴링 스레드는 항상 함께 돌며 놓친 이벤트/없는 경로를 보완
+# - 리런 시 version() 호출은 메모리 dict 조회만 수행 (파일시스템 syscall 없음)
+# - watch()로 등록한 설정 소스만 고정 + watchdog 감시,
+#   세션 입력 등으로 자동 등록된 경로는 개수 상한(LRU)으로 제거, 폴링으로만 확인
+# - 버전 번호는 레지스트리 전체에서 단조 증가 (제거 후 다시 등록돼도 예전 번호와 겹치지 않음)
+# -----------------------------------------------------------------------------
+import hashlib
+import itertools
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except Exception:
+    WATCHDOG_AVAILABLE = False
+
+
+MAX_DIR_ENTRIES = 1000  # 이보다 큰 디렉터리는 하위 목록 대신 디렉터리 자체 mtime만 봄
+
+
+def _signature(path: str):
+    """파일이면 (mtime_ns, size), 디렉터리면 하위 파일들의 시그니처, 없으면 None"""
+    p = Path(path)
+    try:
+        if p.is_dir():
+            entries = []
+            for c in itertools.islice(p.iterdir(), MAX_DIR_ENTRIES + 1):
+                if len(entries) >= MAX_DIR_ENTRIES:
+                    return ("dir", p.stat().st_mtime_ns)
+                if c.is_file():
+                    s = c.stat()
+                    entries.append((c.name, s.st_mtime_ns, s.st_size))
+            return tuple(sorted(entries))
+        s = p.stat()
+        return (s.st_mtime_ns, s.st_size)
+    except OSError:
+        return None
+
+
+class DataVersionRegistry:
+    """데이터 소스별 버전 번호 저장소.
+
+    st.cache_data 로더에 version 인자로 넘기면, 해당 파일이 바뀐 경우에만
+    그 로더(와 같은 버전을 키로 쓰는 파생 인덱스)가 다시 계산된다.
+    설정 소스는 watch()로 미리 등록(고정)하고, version()이 처음 보는 경로는
+    max_dynamic개까지만 보관한다 (오래 안 쓴 것부터 제거).
+    """
+
+    def __init__(self, poll_interval: float = 2.0, max_dynamic: int = 16):
+        self.poll_interval = poll_interval
+        self.max_dynamic = max_dynamic
+        self._lock = threading.Lock()
+        self._clock = itertools.count(1)       # 버전 번호 발급 (전역 단조 증가)
+        self._alias: dict[str, str] = {}       # 입력 경로 → 정규화 경로
+        self._versions: dict[str, int] = {}    # 정규화 경로 → 버전
+        self._sigs: dict[str, object] = {}     # 정규화 경로 → 마지막 시그니처
+        self._dynamic: "OrderedDict[str, None]" = OrderedDict()  # 자동 등록 경로 (LRU 순서)
+        self._listeners: list[Callable[[str, int], None]] = []
+        self._observer = None
+        self._watched_dirs: set[str] = set()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ---- 등록/조회 ----
+    def watch(self, path: str, pinned: bool = True) -> str:
+        """소스 등록 (최초 1회만 stat). 정규화된 키를 반환
+
+        pinned=True: 설정 소스 — 제거되지 않고 watchdog으로도 감시
+        pinned=False: 자동 등록 — max_dynamic개 LRU, 폴링으로만 확인
+        """
+        key = self._alias.get(path)
+        if key is not None and not pinned:
+            return key
+        key = key or os.path.abspath(path)
+        sig = None if key in self._versions else _signature(key)
+        with self._lock:
+            if key not in self._versions:
+                self._versions[key] = next(self._clock)
+                self._sigs[key] = sig
+                if not pinned:
+                    self._dynamic[key] = None
+            elif pinned:
+                self._dynamic.pop(key, None)
+            elif key in self._dynamic:
+                self._dynamic.move_to_end(key)
+            # 고정 소스의 다른 표기(예: ./data/x)는 별칭으로 쌓지 않음 → 별칭도 개수 제한
+            if pinned or key in self._dynamic:
+                self._alias[path] = key
+            self._evict()
+        if pinned:
+            self._schedule(key)
+        return key
+
+    def _evict(self) -> None:
+        """자동 등록 경로가 상한을 넘으면 오래 안 쓴 것부터 제거 (lock 보유 상태에서 호출)"""
+        while len(self._dynamic) > self.max_dynamic:
+            old, _ = self._dynamic.popitem(last=False)
+            self._versions.pop(old, None)
+            self._sigs.pop(old, None)
+            for a in [a for a, k in self._alias.items() if k == old]:
+                del self._alias[a]
+
+    def version(self, path: str) -> int:
+        """현재 버전 (등록되지 않은 경로는 자동 등록)"""
+        while True:
+            key = self._alias.get(path) or self.watch(path, pinned=False)
+            with self._lock:
+                ver = self._versions.get(key)
+                if ver is not None:
+                    if key in self._dynamic:
+                        self._dynamic.move_to_end(key)
+                    return ver
+            # 그 사이 제거됐으면 다시 등록
+
+    def versions(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+    def etag(self, *paths: str) -> str:
+        """여러 소스의 현재 상태를 묶은 태그 (파일 시그니처 기반 → 프로세스 재시작에도 동일)"""
+        keys = [self._alias.get(p) or self.watch(p, pinned=False) for p in paths]
+        with self._lock:
+            raw = repr([(k, self._sigs.get(k)) for k in keys])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def add_listener(self, fn: Callable[[str, int], None]) -> None:
+        """버전 변경 시 fn(정규화 경로, 새 버전) 호출 (감시 스레드에서 실행)"""
+        self._listeners.append(fn)
+
+    # ---- 변경 감지 ----
+    def check(self, key: str) -> bool:
+        """시그니처가 달라졌으면 새 버전 번호 발급. 변경 여부 반환"""
+        sig = _signature(key)
+        with self._lock:
+            if key not in self._versions or self._sigs.get(key) == sig:
+                return False
+            self._sigs[key] = sig
+            ver = self._versions[key] = next(self._clock)
+        for fn in list(self._listeners):
+            try:
+                fn(key, ver)
+            except Exception:
+                pass
+        return True
+
+    def refresh(self) -> list[str]:
+        """등록된 모든 소스를 즉시 재확인 (새로고침 버튼용). 바뀐 소스 목록 반환"""
+        with self._lock:
+            keys = list(self._versions)
+        return [k for k in keys if self.check(k)]
+
+    # ---- 감시 스레드 ----
+    def start(self) -> "DataVersionRegistry":
+        if self._thread is not None:
+            return self
+        if WATCHDOG_AVAILABLE:
+            try:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+                with self._lock:
+                    keys = [k for k in self._versions if k not in self._dynamic]
+                for k in keys:
+                    self._schedule(k)
+            except Exception:
+                self._observer = None
+        self._thread = threading.Thread(target=self._poll_loop, name="data-watch-poll", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _poll_loop(self) -> None:
+        # watchdog가 있으면 폴링은 안전망 역할만 하므로 주기를 늘림
+        interval = self.poll_interval * (15 if self._observer is not None else 1)
+        while not self._stop.wait(interval):
+            self.refresh()
+
+    def _schedule(self, key: str) -> None:
+        if self._observer is None:
+            return
+        d = key if os.path.isdir(key) else os.path.dirname(key)
+        if d in self._watched_dirs or not os.path.isdir(d):
+            return
+        try:
+            self._observer.schedule(_Handler(self), d, recursive=False)
+            self._watched_dirs.add(d)
+        except Exception:
+            pass
+
+    def _on_fs_event(self, src: str) -> None:
+        src = os.path.abspath(src)
+        with self._lock:
+            keys = [k for k in self._versions if k == src or os.path.dirname(src) == k]
+        for k in keys:
+            self.check(k)
+
+
+if WATCHDOG_AVAILABLE:
+    class _Handler(FileSystemEventHandler):
+        def __init__(self, registry: DataVersionRegistry):
+            self.registry = registry
+
+        def on_any_event(self, event):
+            for p in (getattr(event, "src_path", None), getattr(event, "dest_path", None)):
+                if p:
+                    self.registry._on_fs_event(os.fsdecode(p))
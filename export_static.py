@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+# export_static.py
+# -----------------------------------------------------------------------------
+# 정적 사이트 내보내기 (읽기 전용 방문자용)
+# - 월간 달력, 일자 카드 목록, 상세(집회 정보/버스 우회/노선/관련 기사) 페이지를 HTML로,
+#   같은 내용을 JSON으로 미리 생성 → 아무 정적 파일 서버에서나 서비스 가능
+# - 챗봇/건의사항은 인터랙티브 앱(--app-url) 링크로 연결
+# - 새 폴더에 모두 쓴 뒤 --out 심볼릭 링크를 원자적으로 바꿔 끼움 → 옛 페이지가 남지 않고 교체 중 404 없음
+# - --out이 내보내기 표시 파일(EXPORT_MARKER)이 없는 기존 폴더면 건드리지 않고 중단
+# 사용 예) python export_static.py --out site --app-url https://protest-alert.example.org/
+# -----------------------------------------------------------------------------
+import argparse
+import calendar as pycal
+import html
+import json
+import os
+import shutil
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+import data_core
+from data_core import day_num, day_to_date
+from fragments import BASE_CSS, INFO_COLUMNS, day_cards_html, event_info, news_by_slot, news_grid_html, table_html
+
+WEEK_KO = ["월", "화", "수", "목", "금", "토", "일"]
+BUS_COLUMNS = ["버스 정류소 번호", "버스 정류소 명", "노선"]
+EXPORT_MARKER = ".protest-alert-export"  # 이 스크립트가 만든 출력 폴더 표시
+
+EXTRA_CSS = """
+<style>
+body { font-family: "Nanum Gothic", "Apple SD Gothic Neo", sans-serif; max-width: 1080px; margin: 0 auto; padding: 16px; color:#111827; }
+.tbl { border-collapse: collapse; width: 100%; margin: 8px 0 16px 0; font-size: 14px; }
+.tbl th, .tbl td { border: 1px solid #e5e7eb; padding: 8px 10px; text-align: left; }
+.tbl th { background: #f3f4f6; }
+.cal { border-collapse: collapse; width: 100%; table-layout: fixed; }
+.cal th, .cal td { border: 1px solid #e5e7eb; height: 84px; vertical-align: top; padding: 6px; }
+.cal th { height: auto; background: #f9fafb; }
+.cal td a { text-decoration: none; color: #111827; font-weight: 700; }
+.dot { display: inline-block; width: 10px; height: 10px; border-radius: 50%; margin: 2px; }
+.nav { display: flex; justify-content: space-between; align-items: center; margin: 8px 0 16px 0; }
+.app-link { display: inline-block; margin: 8px 0; padding: 8px 14px; border-radius: 100px; border: 1px solid #000; text-decoration: none; color: #000; }
+</style>
+"""
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        "<!doctype html><html lang='ko'><head><meta charset='utf-8'>"
+        "<meta name='viewport' content='width=device-width, initial-scale=1'>"
+        f"<title>{html.escape(title)}</title>{BASE_CSS}{EXTRA_CSS}</head>"
+        f"<body><div class='app-header'>집회/시위 알림 서비스</div>{body}</body></html>"
+    )
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def _month_key(d: date) -> str:
+    return f"{d.year:04d}-{d.month:02d}"
+
+
+def _shift_month(y: int, m: int, k: int) -> tuple[int, int]:
+    n = y * 12 + (m - 1) + k
+    return n // 12, n % 12 + 1
+
+
+def month_page(y: int, m: int, dots_by_day: dict[date, list[str]], months: set[str]) -> str:
+    rows = []
+    for week in pycal.Calendar(firstweekday=6).monthdatescalendar(y, m):  # 일요일 시작 (앱 달력과 동일)
+        cells = []
+        for d in week:
+            if d.month != m:
+                cells.append("<td></td>")
+                continue
+            dots = "".join(f"<span class='dot' style='background:{c}'></span>" for c in dots_by_day.get(d, []))
+            label = f"<a href='../day/{d.isoformat()}.html'>{d.day}</a>" if d in dots_by_day else str(d.day)
+            cells.append(f"<td>{label}<div>{dots}</div></td>")
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    head = "".join(f"<th>{w}</th>" for w in ["일", "월", "화", "수", "목", "금", "토"])
+    prev_key, next_key = "%04d-%02d" % _shift_month(y, m, -1), "%04d-%02d" % _shift_month(y, m, 1)
+    prev_a = f"<a href='{prev_key}.html'>◀</a>" if prev_key in months else "<span></span>"
+    next_a = f"<a href='{next_key}.html'>▶</a>" if next_key in months else "<span></span>"
+    body = (
+        "<h3>이달의 집회</h3>"
+        f"<div class='nav'>{prev_a}<b>{y}년 {m}월</b>{next_a}</div>"
+        f"<table class='cal'><thead><tr>{head}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+    )
+    return _page(f"{y}년 {m}월 집회", body)
+
+
+def day_page(d: date, day_df: pd.DataFrame, bus_html: str) -> str:
+    body = [
+        f"<p><a href='../month/{_month_key(d)}.html'>← 달력으로</a></p>",
+        f"<h4>{d.month}월 {d.day}일({WEEK_KO[d.weekday()]}) 집회 일정 안내</h4>",
+        day_cards_html(day_df, d, href_fmt="../detail/{date}-{idx}.html"),
+        "<h6>버스 우회 정보</h6>",
+    ]
+    body.append(bus_html)
+    return _page(f"{d.isoformat()} 집회 일정", "\n".join(body))
+
+
+def _bus_table(bus_rows: pd.DataFrame) -> str:
+    if bus_rows.empty:
+        return "<div class='sub'>※ 해당 날짜의 버스 우회 정보가 없습니다.</div>"
+    rows = [[r["ARS_ID"], r["정류소명"], r["노선"] if isinstance(r["노선"], str) else ""] for r in bus_rows.to_dict("records")]
+    return table_html(BUS_COLUMNS, rows)
+
+
+def detail_page(d: date, idx: int, row, items: list[dict], bus_html: str, app_url: str) -> str:
+    news = news_grid_html(items, d) if items else "<div class='sub'>해당 시간대의 관련 기사를 찾지 못했습니다.</div>"
+    links = ""
+    if app_url:
+        q = f"?view=detail&date={d.isoformat()}&idx={idx}"
+        links = (
+            f"<a class='app-link' href='{html.escape(app_url + q)}'>건의사항 남기기</a> "
+            f"<a class='app-link' href='{html.escape(app_url + q + '&chat=open')}'>💬 챗봇에게 묻기</a>"
+        )
+    body = "\n".join(
+        [
+            f"<p><a href='../day/{d.isoformat()}.html'>← 목록으로</a></p>",
+            f"<h4>{d.month}월 {d.day}일({WEEK_KO[d.weekday()]}) 상세 정보</h4>",
+            "<h6>오늘의 집회/시위</h6>",
+            table_html(INFO_COLUMNS, [event_info(row)]),
+            "<h6>버스 우회 정보</h6>",
+            bus_html,
+            "<h6>집회/시위 관련 기사 보기</h6>",
+            f"<div class='news-wrap'>{news}</div>",
+            links,
+        ]
+    )
+    return _page(f"{d.isoformat()} 집회 상세", body)
+
+
+def _owned(p: Path) -> bool:
+    return (p / EXPORT_MARKER).is_file()
+
+
+def _check_target(out: Path) -> None:
+    """교체해도 되는 출력 경로인지 확인 (없음 / 빈 폴더 / 이전 내보내기 결과만 허용)"""
+    if not out.exists() and not out.is_symlink():
+        return
+    if out.is_dir() and (_owned(out) or (not out.is_symlink() and not any(out.iterdir()))):
+        return
+    raise ValueError(
+        f"{out}은(는) 이전 내보내기 결과가 아닙니다 ({EXPORT_MARKER} 없음). 빈 폴더나 새 경로를 지정하세요."
+    )
+
+
+def _swap_in(build: Path, out: Path) -> None:
+    """out을 build를 가리키는 심볼릭 링크로 원자적으로 교체 (교체 중에도 out 경로는 항상 존재)"""
+    prev = out.resolve() if out.is_symlink() else None
+    if out.is_dir() and not out.is_symlink():
+        # 일반 폴더로 만든 이전 출력(_check_target 통과분)은 한 번만 지우고 링크로 전환
+        shutil.rmtree(out)
+    link = out.parent / f".{out.name}-link-{os.getpid()}"
+    if link.is_symlink():
+        link.unlink()
+    os.symlink(build.name, link)
+    os.replace(link, out)
+    if prev is not None and prev != build and prev.parent == out.parent and _owned(prev):
+        shutil.rmtree(prev, ignore_errors=True)
+
+
+def export(out_dir: str, events_path: str, bus_path: str, routes_path: str, app_url: str = "") -> dict:
+    final = Path(os.path.abspath(out_dir))  # resolve()는 링크를 따라가므로 쓰지 않음
+    _check_target(final)
+    final.parent.mkdir(parents=True, exist_ok=True)
+    build = Path(tempfile.mkdtemp(dir=final.parent, prefix=f".{final.name}-build-"))
+    try:
+        counts = _export_into(build, events_path, bus_path, routes_path, app_url)
+        (build / EXPORT_MARKER).write_text("export_static.py\n", encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(build, ignore_errors=True)
+        raise
+    build.chmod(0o755)  # mkdtemp는 0700으로 만듦 → 정적 서버가 읽을 수 있게
+    _swap_in(build, final)
+    return counts
+
+
+def _export_into(out: Path, events_path: str, bus_path: str, routes_path: str, app_url: str) -> dict:
+    df = data_core.load_events(events_path)
+    bus_df = data_core.load_bus(bus_path)
+    routes_df = data_core.load_routes(routes_path)
+
+    days = set(df["_day"].unique().tolist())
+    if not bus_df.empty:
+        for s, e in zip(bus_df["start_day"].to_numpy(), bus_df["end_day"].to_numpy()):
+            days.update(range(int(s), int(e) + 1))
+    days = sorted(day_to_date(x) for x in days)
+
+    dots = data_core.df_to_month_dots(df)
+    dots_by_day: dict[date, list[str]] = {}
+    for ev in dots:
+        dots_by_day.setdefault(date.fromisoformat(ev["extendedProps"]["d"]), []).append(ev["color"])
+    for d in days:
+        dots_by_day.setdefault(d, [])
+
+    counts = {"months": 0, "days": 0, "details": 0}
+    months = sorted({_month_key(d) for d in days})
+    for key in months:
+        y, m = int(key[:4]), int(key[5:])
+        _write(out / "month" / f"{key}.html", month_page(y, m, dots_by_day, set(months)))
+        lo, hi = day_num(date(y, m, 1)), day_num(date(*_shift_month(y, m, 1), 1))
+        month_df = df[(df["_day"] >= lo) & (df["_day"] < hi)]
+        _write(out / "data" / "months" / f"{key}.json",
+               json.dumps({"month": key, "events": data_core.df_to_month_dots(month_df)}, ensure_ascii=False))
+        counts["months"] += 1
+
+    # 기사 링크는 (일, 시작, 종료) 단위로, 일자별 행 위치는 일 번호 단위로 한 번만 묶음
+    # (일자 슬라이스/버스표는 날짜당 한 번만 계산해 일자·상세 페이지와 JSON이 같이 씀)
+    news = news_by_slot(df)
+    rows_by_day = df.groupby("_day", sort=False).indices
+    for d in days:
+        day_df = data_core.filter_by_day(df.iloc[rows_by_day.get(day_num(d), [])], d)
+        bus_rows = data_core.bus_rows_with_routes(bus_df, routes_df, d)
+        bus_html = _bus_table(bus_rows)
+        _write(out / "day" / f"{d.isoformat()}.html", day_page(d, day_df, bus_html))
+        day_json = {
+            "date": d.isoformat(),
+            "events": data_core.events_payload(df, d, day_df=day_df),
+            "detours": data_core.detours_payload(bus_df, routes_df, d, rows=bus_rows),
+            "news": {},
+        }
+        for idx, row in enumerate(day_df.to_dict("records")):
+            items = news.get((int(row["_day"]), int(row["_start_min"]), int(row["_end_min"])), [])
+            _write(out / "detail" / f"{d.isoformat()}-{idx}.html", detail_page(d, idx, row, items, bus_html, app_url))
+            day_json["news"][str(idx)] = items
+            counts["details"] += 1
+        _write(out / "data" / "days" / f"{d.isoformat()}.json", json.dumps(day_json, ensure_ascii=False))
+        counts["days"] += 1
+
+    today_key = _month_key(date.today())
+    start = today_key if today_key in months else (months[-1] if months else None)
+    index = "<ul>" + "".join(f"<li><a href='month/{k}.html'>{k[:4]}년 {int(k[5:])}월</a></li>" for k in months) + "</ul>"
+    head = f"<meta http-equiv='refresh' content='0; url=month/{start}.html'>" if start else ""
+    _write(out / "index.html", _page("집회/시위 알림 서비스", head + "<h3>월별 집회 일정</h3>" + index))
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="달력/일자/상세 페이지 정적 내보내기")
+    ap.add_argument("--out", default="site", help="출력 폴더")
+    ap.add_argument("--events", default="data/protest_data.xlsx", help="집회 데이터 경로 (xlsx/csv)")
+    ap.add_argument("--bus", default="data/bus_data.xlsx", help="버스 우회 데이터 경로 (xlsx)")
+    ap.add_argument("--routes", default="routes_final.csv", help="버스 노선 데이터 경로 (CSV)")
+    ap.add_argument("--app-url", default="", help="챗봇/건의사항용 인터랙티브 앱 주소")
+    args = ap.parse_args()
+    try:
+        counts = export(args.out, args.events, args.bus, args.routes, app_url=args.app_url)
+    except ValueError as e:
+        raise SystemExit(f"❌ {e}")
+    print(f"내보내기 완료: {args.out}  (월 {counts['months']} · 일 {counts['days']} · 상세 {counts['details']})")
+
+
+if __name__ == "__main__":
+    main()
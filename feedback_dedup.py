@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# feedback_dedup.py
+# -----------------------------------------------------------------------------
+# 건의사항 유사 중복 탐지 (MinHash + LSH)
+# - 문장 → tokenize_ko 토큰열 → 글자 2-gram 슁글 → MinHash 서명(128개)
+# - 집회(날짜|시작|종료|장소)별 LSH 인덱스: 밴드 버킷 조회로 후보만 비교 (전체 스캔 없음)
+# - 추정 자카드 유사도 ≥ threshold면 같은 묶음(클러스터)으로 처리
+# - 워드클라우드는 묶음 대표 문장만, 관리자 요약(이 CLI / 앱 ?admin=ADMIN_TOKEN)은 묶음별 건수 사용
+# 사용 예) python feedback_dedup.py data/feedback.csv
+# -----------------------------------------------------------------------------
+import argparse
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from data_core import load_feedback, tokenize_ko
+
+_PRIME = (1 << 61) - 1
+_MASK32 = (1 << 32) - 1
+
+
+def shingles(text: str, n: int = 2) -> set[str]:
+    """토큰을 이어 붙인 문자열의 글자 n-gram (조사/어미가 조금 달라도 겹치도록)"""
+    s = "".join(tokenize_ko(text))
+    if not s:
+        return set()
+    return {s[i:i + n] for i in range(max(len(s) - n + 1, 1))}
+
+
+def event_key(d, start, end, location) -> str:
+    return f"{d}|{start}|{end}|{location}"
+
+
+class MinHasher:
+    """(a·x + b) mod p 형태의 해시 num_perm개로 MinHash 서명 생성"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, sh: set[str]) -> np.ndarray:
+        if not sh:
+            return np.full(self.num_perm, _MASK32, dtype=np.uint32)
+        x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in sh), dtype=np.uint64, count=len(sh))
+        # uint64 곱셈은 2^64에서 잘리지만 서명 용도로는 충분히 균일함
+        h = (x[:, None] * self.a[None, :] + self.b[None, :]) % np.uint64(_PRIME)
+        return (h & np.uint64(_MASK32)).astype(np.uint32).min(axis=0)
+
+
+class LSHIndex:
+    """MinHash 서명 LSH 인덱스 (bands × rows = num_perm)"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands로 나누어떨어져야 합니다.")
+        self.bands, self.rows = bands, num_perm // bands
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+        self._sigs: dict[int, np.ndarray] = {}
+
+    def _keys(self, sig: np.ndarray):
+        for i in range(self.bands):
+            yield i, sig[i * self.rows:(i + 1) * self.rows].tobytes()
+
+    def add(self, item: int, sig: np.ndarray) -> None:
+        self._sigs[item] = sig
+        for i, k in self._keys(sig):
+            self._buckets[i].setdefault(k, []).append(item)
+
+    def query(self, sig: np.ndarray, threshold: float) -> list[tuple[int, float]]:
+        """후보(같은 밴드 버킷) 중 추정 유사도 ≥ threshold인 항목, 유사도 내림차순"""
+        cand = set()
+        for i, k in self._keys(sig):
+            cand.update(self._buckets[i].get(k, ()))
+        hits = [(c, float(np.mean(self._sigs[c] == sig))) for c in cand]
+        return sorted([h for h in hits if h[1] >= threshold], key=lambda h: -h[1])
+
+    def __len__(self):
+        return len(self._sigs)
+
+
+class FeedbackDeduper:
+    """집회별 LSH 인덱스 + 묶음(대표 행) 관리. 행 번호는 feedback.csv의 행 순서
+
+    CSV는 뒤에 덧붙이기만 하므로 sync()는 새로 늘어난 행만 인덱싱한다.
+    """
+
+    def __init__(self, threshold: float = 0.5, num_perm: int = 128, bands: int = 32):
+        self.threshold = threshold
+        self.num_perm, self.bands = num_perm, bands
+        self.hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._index: dict[str, LSHIndex] = {}
+        self._root: list[int] = []     # 행 → 묶음 대표 행
+        self._sizes: dict[int, int] = {}
+        self._first_row: pd.DataFrame | None = None
+
+    def __len__(self):
+        return len(self._root)
+
+    # ---- 조회/추가 ----
+    def find(self, key: str, text: str) -> tuple[int, float] | None:
+        """같은 집회에 유사한 기존 의견이 있으면 (대표 행, 유사도)"""
+        sig = self.hasher.signature(shingles(text))
+        with self._lock:  # 다른 세션의 sync()가 인덱스를 고치는 중일 수 있음
+            idx = self._index.get(key)
+            if idx is None:
+                return None
+            hits = idx.query(sig, self.threshold)
+            return (self._root[hits[0][0]], hits[0][1]) if hits else None
+
+    def _add(self, key: str, text: str) -> int:
+        row = len(self._root)
+        sig = self.hasher.signature(shingles(text))
+        idx = self._index.setdefault(key, LSHIndex(self.num_perm, self.bands))
+        empty = bool((sig == _MASK32).all())  # 토큰이 없는 의견은 묶지 않음
+        hits = [] if empty else idx.query(sig, self.threshold)
+        root = self._root[hits[0][0]] if hits else row
+        if not empty:
+            idx.add(row, sig)
+        self._root.append(root)
+        self._sizes[root] = self._sizes.get(root, 0) + 1
+        return root
+
+    def sync(self, fb_df: pd.DataFrame) -> "FeedbackDeduper":
+        """fb_df에서 아직 인덱싱하지 않은 뒷부분 행만 추가 (파일이 교체됐으면 전체 재구성)"""
+        with self._lock:
+            n = 0 if fb_df is None else len(fb_df)
+            head = None if not n else fb_df.iloc[:1].astype(str)
+            if n < len(self._root) or (self._first_row is not None and head is not None and not head.equals(self._first_row)):
+                self.reset()
+            if n <= len(self._root):
+                return self
+            new = fb_df.iloc[len(self._root):]
+            cols = [new[c] if c in new.columns else pd.Series([""] * len(new), index=new.index)
+                    for c in ["date", "start", "end", "location", "feedback"]]
+            for d, s, e, loc, text in zip(*cols):
+                self._add(event_key(d, s, e, loc), text if isinstance(text, str) else "")
+            if self._first_row is None:
+                self._first_row = head
+        return self
+
+    # ---- 묶음 정보 ----
+    # 모두 잠금 안에서 뜬 사본을 돌려줌 (호출 뒤 다른 세션이 sync()해도 안 바뀜)
+    def roots(self) -> np.ndarray:
+        with self._lock:
+            return np.array(self._root, dtype=np.int64)
+
+    def representative_mask(self) -> np.ndarray:
+        """각 행이 자기 묶음의 대표(처음 들어온 의견)인지"""
+        r = self.roots()
+        return r == np.arange(len(r))
+
+    def cluster_size(self, row: int) -> int:
+        with self._lock:
+            return self._sizes.get(self._root[row], 1)
+
+
+def cluster_summary(fb_df: pd.DataFrame, deduper: FeedbackDeduper | None = None, date_filter=None) -> pd.DataFrame:
+    """관리자 요약용: 묶음별 대표 의견/건수 (건수 내림차순)"""
+    cols = ["날짜", "집회 장소", "대표 의견", "건수"]
+    if fb_df is None or fb_df.empty or "feedback" not in fb_df.columns:
+        return pd.DataFrame(columns=cols)
+    deduper = (deduper or FeedbackDeduper()).sync(fb_df)
+    df = fb_df.reset_index(drop=True).assign(_root=deduper.roots()[: len(fb_df)])
+    if date_filter is not None and "date" in df.columns:
+        df = df[df["date"].astype(str) == str(date_filter)]
+    if df.empty:
+        return pd.DataFrame(columns=cols)
+    sizes = df.groupby("_root", sort=False).size()
+    rep = fb_df.reset_index(drop=True).loc[sizes.index]
+    out = pd.DataFrame(
+        {
+            "날짜": rep.get("date", pd.Series("", index=rep.index)).astype(str).to_numpy(),
+            "집회 장소": rep.get("location", pd.Series("", index=rep.index)).astype(str).to_numpy(),
+            "대표 의견": rep["feedback"].astype(str).to_numpy(),
+            "건수": sizes.to_numpy(),
+        }
+    )
+    return out.sort_values("건수", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="건의사항 유사 중복 묶음 요약")
+    ap.add_argument("path", nargs="?", default="data/feedback.csv")
+    ap.add_argument("--date", default=None, help="YYYY-MM-DD (해당 날짜만)")
+    ap.add_argument("--threshold", type=float, default=0.5, help="묶음 판정 유사도 (기본 0.5)")
+    ap.add_argument("--top", type=int, default=30)
+    args = ap.parse_args()
+    fb = load_feedback(args.path)
+    summary = cluster_summary(fb, FeedbackDeduper(threshold=args.threshold), date_filter=args.date)
+    print(f"건의사항 {len(fb)}건 → 묶음 {len(summary)}개")
+    print(summary.head(args.top).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+# fragments.py
+# -----------------------------------------------------------------------------
+# HTML 조각 렌더러 (Streamlit 비의존)
+# - 전역 CSS, 일자 카드 목록, 집회 정보 행, 뉴스 카드 그리드
+# - app.py(st.markdown)와 export_static.py(정적 HTML)가 같은 마크업을 사용
+# - FragmentCache: (조각 종류, 날짜, 집회 순번, 소스 경로·데이터 버전) 단위 LRU 캐시
+# -----------------------------------------------------------------------------
+import html
+import textwrap
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Callable
+
+import pandas as pd
+
+from data_core import _domain, _first_url
+
+# 전역 CSS (타이포/카드/버튼/캘린더/뉴스카드/여백 + FAB/모달)
+BASE_CSS = """
+<style>
+/* 전체 배경 */
+.stApp, .main, [data-testid="stHeader"] { background:#ffffff !important; }
+
+/* 상단 타이틀 박스 */
+.app-header{
+  border:1px solid #e5e7eb; border-radius:12px;
+  background:#f3f4f6; padding:14px 24px;
+  font-weight:800; font-size:20px; color:#111827;
+  text-align:center; margin:6px 0 16px 0;
+}
+
+/* 카드 공통 */
+.card { border:1px solid #e5e7eb; border-radius:14px; padding:16px; margin:12px 6px; background:#fff; }
+.time { font-weight:800; font-size:18px; margin-bottom:6px; color:#111827; }
+.sub  { color:#6b7280; font-size:14px; margin-bottom:8px; }
+.meta { color:#374151; font-size:14px; }
+a.card-link { display:block; text-decoration:none; color:inherit; }
+a.card-link .card:hover { border-color:#94a3b8; background:#f8fafc; }
+
+/* FullCalendar: 도트/버튼 (페이지 전역, iframe 밖) */
+.fc .fc-daygrid-dot-event .fc-event-time,
+.fc .fc-daygrid-dot-event .fc-event-title,
+.fc .fc-daygrid-event-harness .fc-event-time,
+.fc .fc-daygrid-event-harness .fc-event-title { display:none !important; }
+.fc-daygrid-dot-event > .fc-event-dot { width:10px; height:10px; border:0; }
+
+/* prev/next 커스텀 아이콘 */
+.fc .fc-prev-button .fc-icon, .fc .fc-next-button .fc-icon { display:none !important; }
+.fc .fc-prev-button:before { content:"◀"; font-size:22px; color:#000; }
+.fc .fc-next-button:before { content:"▶"; font-size:22px; color:#000; }
+.fc-daygrid-more-link { font-size:12px; color:#000; }
+.fc-daygrid-more-link::after { content:""; }
+
+/* ====== 뉴스 카드 ====== */
+.news-wrap { margin:0; }
+.news-grid { display:flex; flex-direction:column; gap:12px; }
+.news-card { display:flex; flex-direction:column; gap:6px; padding:14px 16px; border:1px solid #e5e7eb; border-radius:12px; background:#fff; }
+.news-title { font-size:16px; font-weight:700; color:#111827; line-height:1.35; }
+.news-meta  { font-size:13px; color:#6b7280; }
+.news-link  { display:inline-block; margin-left:8px; padding:5px 10px; border-radius:10px; background:#eef2ff; border:1px solid #c7d2fe; text-decoration:none; font-weight:600; color:#1f2937; }
+.news-link:hover { background:#e0e7ff; }
+
+/* 섹션 간격 유틸 */
+.gap-16 { height:16px; }
+.gap-24 { height:24px; }
+
+/* ====== 채팅 벌룬/입력 ====== */
+.chat-wrap { margin-top:4px; }
+.chat-scroll{ height:240px; overflow-y:auto; padding:10px 12px; background:#ffffff; }
+.msg-row{ display:flex; margin:8px 0; }
+.msg-row.user{ justify-content:flex-end; }
+.bubble{ max-width:520px; padding:10px 14px; border-radius:14px; font-size:16px; line-height:1.5; word-break:break-word; white-space:pre-wrap; }
+.bubble.user{ background:#2A52BF; color:#fff; }
+.bubble.bot { background:#eeeeee; color:#000; }
+
+.chat-input-area { padding:8px 0 0 0; }
+div[data-baseweb="input"] > div {
+  background:#fff !important; border:1px solid #000 !important; border-radius:100px !important;
+  padding:8px 14px !important; color:#000; font-size:15px;
+}
+div.stButton > button{
+  background-color: var(--blue); color:#000; border-radius:100px; border:1px solid #000;
+  font-weight:600; font-size:15px;
+}
+div.stButton > button:hover{ background-color:#1d3e91; border:1px solid #1d3e91; color:#fff; }
+
+/* ====== FAB ====== */
+.fab-chat {
+  position: fixed; right: 24px; bottom: 24px;
+  width: 56px; height: 56px; border-radius: 50%;
+  display:flex; align-items:center; justify-content:center;
+  background:#2A52BF; color:#fff; text-decoration:none;
+  font-size:24px; font-weight:700; box-shadow:0 8px 20px rgba(0,0,0,.15);
+  z-index: 9998; border:1px solid rgba(0,0,0,.08);
+}
+.fab-chat:hover { filter: brightness(1.05); }
+</style>
+"""
+
+INFO_COLUMNS = ["집회 시간", "집회 장소(행진로)", "신고 인원", "관련 이슈"]
+
+
+def _blank(v) -> bool:
+    return str(v).strip() in ["nan", "None", ""]
+
+
+def head_label(row) -> str:
+    """신고 인원 표시 ('1200명'; 숫자가 아닌 원문은 '1,200명'/'약 300명'처럼 그대로)"""
+    text = str(row.get("_head_text", "")).strip()
+    if _blank(text):
+        return f"{int(row['_head'])}명" if pd.notna(row.get("_head")) else ""
+    if pd.notna(pd.to_numeric(text, errors="coerce")) and pd.notna(row.get("_head")):
+        return f"{int(row['_head'])}명"
+    return text if text.endswith("명") else f"{text}명"
+
+
+def event_info(row) -> list[str]:
+    """상세 화면 '오늘의 집회/시위' 표 한 행 (INFO_COLUMNS 순서)"""
+    time_str = f"{row['_start']} ~ {row['_end']}"
+    loc_str = f"{(row['_dist']+' ') if row['_dist'] not in ['','nan','None'] else ''}{row['_loc']}"
+    head_str = head_label(row)
+    keywords = str(row["_memo"]).strip() if str(row["_memo"]).strip() not in ["nan", "None"] else ""
+    return [time_str, loc_str, head_str, keywords]
+
+
+def day_cards_html(day_df: pd.DataFrame, d: date, href_fmt: str = "?view=detail&date={date}&idx={idx}") -> str:
+    """일자 집회 카드 목록 (filter_by_day 결과 기준, idx는 상세 링크 순번)"""
+    if len(day_df) == 0:
+        return '<div class="sub">등록된 집회가 없습니다.</div>'
+    parts = []
+    for i, r in enumerate(day_df.to_dict("records")):
+        # 원본 데이터 값은 모두 escape (정적 내보내기에서는 그대로 공개 HTML이 됨)
+        loc_line = html.escape(str(r["_loc"]))
+        if r["_dist"] and not _blank(r["_dist"]):
+            loc_line = f"{html.escape(str(r['_dist']))}  {loc_line}"
+        metas = []
+        head_str = head_label(r)
+        if head_str:
+            metas.append(f"신고 인원 {html.escape(head_str)}")
+        if r["_memo"] and not _blank(r["_memo"]):
+            metas.append(html.escape(str(r["_memo"])))
+        meta_text = " · ".join(metas)
+        meta_html = f"<div class='meta'>{meta_text}</div>" if meta_text else ""
+        href = href_fmt.format(date=d.isoformat(), idx=i)
+        parts.append(
+            textwrap.dedent(
+                f"""
+                <a class="card-link" href="{html.escape(href)}">
+                  <div class="card">
+                    <div class="time">{r["_start"]} ~ {r["_end"]}</div>
+                    <div class="sub">{loc_line}</div>
+                    {meta_html}
+                  </div>
+                </a>
+                """
+            ).strip()
+        )
+    return "\n".join(parts)
+
+
+def _news_from(links, titles) -> list[dict]:
+    items, seen = [], set()
+    for link, title in zip(links, titles):
+        url = _first_url(str(link))
+        title = str(title).strip()
+        if not url or not title:
+            continue
+        if url in seen:
+            continue
+        seen.add(url)
+        items.append({"url": url, "title": title})
+    return items
+
+
+def news_items(df_all: pd.DataFrame, row) -> list[dict]:
+    """같은 날짜/시간대 집회 행들의 기사 링크 (URL 중복 제거)"""
+    same = (
+        (df_all["_day"] == row["_day"])
+        & (df_all["_start_min"] == row["_start_min"])
+        & (df_all["_end_min"] == row["_end_min"])
+    )
+    rows = df_all[same][
+        ["__link", "__title"]
+    ].dropna(how="all")
+    return _news_from(rows["__link"], rows["__title"])
+
+
+def news_by_slot(df_all: pd.DataFrame) -> dict[tuple[int, int, int], list[dict]]:
+    """(일, 시작분, 종료분) → news_items 결과. 전체 프레임을 한 번만 묶어 계산 (일괄 내보내기용)"""
+    rows = df_all[["_day", "_start_min", "_end_min", "__link", "__title"]].dropna(how="all", subset=["__link", "__title"])
+    out = {}
+    for key, g in rows.groupby(["_day", "_start_min", "_end_min"], sort=False):
+        items = _news_from(g["__link"], g["__title"])
+        if items:
+            out[tuple(int(k) for k in key)] = items
+    return out
+
+
+def news_grid_html(items: list[dict], d: date, limit: int = 8) -> str:
+    """뉴스 카드 그리드 (최대 limit개)"""
+    html_parts = ["<div class='news-grid'>"]
+    for it in items[:limit]:
+        # noreferrer: 관리자 URL의 ?admin= 토큰이 기사 사이트에 Referer로 넘어가지 않도록
+        url = html.escape(it["url"], quote=True)
+        title = html.escape(it["title"])
+        dom = html.escape(_domain(it["url"]))
+        meta = f"{dom} · {d:%Y.%m.%d}"
+        card = (
+            "<div class='news-card'>"
+            f"<div class='news-title'>{title}</div>"
+            f"<div class='news-meta'>{meta}"
+            f"<a class='news-link' href='{url}' target='_blank' rel='noopener noreferrer'>원문 보기 ↗</a>"
+            "</div></div>"
+        )
+        html_parts.append(card)
+    html_parts.append("</div>")
+    return "".join(html_parts)
+
+
+def table_html(columns: list[str], rows: list[list]) -> str:
+    """단순 HTML 표 (정적 페이지용, 값은 escape)"""
+    head = "".join(f"<th>{html.escape(str(c))}</th>" for c in columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td>{'' if v is None else html.escape(str(v))}</td>" for v in r) + "</tr>" for r in rows
+    )
+    return f"<table class='tbl'><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+
+class FragmentCache:
+    """렌더링된 조각(HTML/표 데이터) LRU 캐시 (세션 공용, 스레드 안전)
+
+    키에 (소스 경로, 데이터 버전)을 포함하므로 따로 비우지 않는다. 옛 버전/다른 경로의
+    조각은 더 이상 조회되지 않아 LRU로 자연스럽게 밀려난다.
+    반환값은 여러 세션이 공유하므로 호출 측에서 수정하지 않는다.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key: tuple, render: Callable[[], object]):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = render()  # 렌더링은 잠금 밖에서 (동시 미스는 같은 값을 두 번 만들 뿐)
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+# llm_gateway.py
+# -----------------------------------------------------------------------------
+# 프로세스 공용 LLM 게이트웨이 (챗봇 요청 합치기 + 동시 실행 제한)
+# - single-flight: 같은 프롬프트가 처리 중이면 새 호출 없이 그 결과를 같이 기다림
+# - 작업자 수 제한(workers) + 대기열 상한(max_queue): 꽉 차면 즉시 "혼잡" 답변
+# - 대기 시간 초과(timeout) 시에도 "혼잡" 답변 (아직 시작 안 한 요청은 취소)
+# - 지표: 대기열 길이/처리 중 수/합쳐진 요청/거절/시간 초과, 대기·처리 시간(ms)
+# - FakeLLM: 지연시간을 조절할 수 있는 로컬 가짜 백엔드 (테스트/부하 측정용)
+# -----------------------------------------------------------------------------
+import hashlib
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable
+
+from tracing import Tracer, percentile
+
+BUSY_REPLY = "⏳ 지금 문의가 많아 답변이 지연되고 있습니다. 잠시 후 다시 질문해 주세요."
+
+
+class FakeLLM:
+    """latency(±jitter)초 대기 후 프롬프트 앞부분을 돌려주는 가짜 백엔드"""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, reply: str = "(fake) {question}"):
+        self.latency, self.jitter, self.reply = latency, jitter, reply
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        question = prompt.rsplit("질문:", 1)[-1].split("\n", 1)[0].strip() or prompt[:40]
+        return self.reply.format(question=question)
+
+    predict = __call__  # ChatOpenAI.predict와 같은 모양
+
+
+_shared_fakes: dict[float, FakeLLM] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_fake(latency: float) -> FakeLLM:
+    """지연시간별 프로세스 공용 FakeLLM (앱과 부하 테스트가 같은 인스턴스의 calls를 봄)"""
+    with _shared_lock:
+        fake = _shared_fakes.get(latency)
+        if fake is None:
+            fake = _shared_fakes[latency] = FakeLLM(latency=latency)
+        return fake
+
+
+class LLMGateway:
+    """backend(prompt) -> str 호출을 합치고 제한하는 게이트웨이 (스레드 안전)"""
+
+    def __init__(
+        self,
+        backend: Callable[[str], str],
+        workers: int = 4,
+        max_queue: int = 32,
+        timeout: float = 30.0,
+        busy_reply: str = BUSY_REPLY,
+        tracer: Tracer | None = None,
+        max_samples: int = 1024,
+    ):
+        self.backend = backend
+        self.workers, self.max_queue, self.timeout = workers, max_queue, timeout
+        self.busy_reply = busy_reply
+        self.tracer = tracer
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-gw")
+        self._lock = threading.Lock()
+        self._inflight: dict[str, list] = {}  # 프롬프트 키 → [Future, 대기자 수]
+        self._queued = 0
+        self._running = 0
+        self.counts = {"requests": 0, "calls": 0, "coalesced": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+        self._wait_ms: deque = deque(maxlen=max_samples)
+        self._service_ms: deque = deque(maxlen=max_samples)
+        if tracer is not None:
+            tracer.add_gauge("llm_queue_depth", lambda: self._queued, "LLM requests waiting for a worker.")
+            tracer.add_gauge("llm_inflight", lambda: self._running, "LLM requests running on the backend.")
+            helps = {
+                "coalesced": "LLM requests served by an identical in-flight call.",
+                "rejected": "LLM requests rejected because the queue was full.",
+                "timeouts": "LLM requests that timed out waiting for an answer.",
+            }
+            for k, h in helps.items():
+                tracer.add_gauge(f"llm_{k}_total", lambda k=k: self.counts[k], h, kind="counter")
+
+    @staticmethod
+    def _key(prompt: str) -> str:
+        return hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+
+    # ---- 제출/대기 ----
+    def submit(self, prompt: str) -> tuple[str, Future] | None:
+        """(키, Future). 대기열이 가득 차면 None (backpressure)"""
+        key = self._key(prompt)
+        with self._lock:
+            self.counts["requests"] += 1
+            hit = self._inflight.get(key)
+            if hit is not None:
+                hit[1] += 1
+                self.counts["coalesced"] += 1
+                return key, hit[0]
+            # 실행 중 + 대기 중이 (작업자 수 + 대기열 상한)에 닿으면 거절
+            if self._queued + self._running >= self.workers + self.max_queue:
+                self.counts["rejected"] += 1
+                return None
+            self._queued += 1
+            self.counts["calls"] += 1
+            fut = self._pool.submit(self._run, key, prompt, time.perf_counter())
+            self._inflight[key] = [fut, 1]
+        return key, fut
+
+    def ask(self, prompt: str, timeout: float | None = None) -> str:
+        """답변 또는 혼잡 안내 문구 (예외를 던지지 않음)"""
+        sub = self.submit(prompt)
+        if sub is None:
+            return self.busy_reply
+        key, fut = sub
+        try:
+            return fut.result(timeout=self.timeout if timeout is None else timeout)
+        except (FutureTimeout, CancelledError):
+            self._give_up(key, fut)
+            return self.busy_reply
+        except Exception as e:
+            with self._lock:
+                self.counts["errors"] += 1
+            return f"❌ 답변 생성 중 오류가 발생했습니다: {e}"
+
+    def _give_up(self, key: str, fut: Future) -> None:
+        with self._lock:
+            self.counts["timeouts"] += 1
+            hit = self._inflight.get(key)
+            if hit is None or hit[0] is not fut:
+                return
+            hit[1] -= 1
+            # 기다리는 사람이 없고 아직 시작 전이면 취소해서 대기열 자리를 돌려줌
+            if hit[1] <= 0 and fut.cancel():
+                self._inflight.pop(key, None)
+                self._queued -= 1
+
+    def _run(self, key: str, prompt: str, enqueued: float) -> str:
+        start = time.perf_counter()
+        wait_ms = (start - enqueued) * 1000.0
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_ms.append(wait_ms)
+        try:
+            return self.backend(prompt)
+        finally:
+            service_ms = (time.perf_counter() - start) * 1000.0
+            with self._lock:
+                self._running -= 1
+                self._service_ms.append(service_ms)
+                self._inflight.pop(key, None)
+            if self.tracer is not None:
+                self.tracer.record("llm.queue_wait", wait_ms)
+                self.tracer.record("llm.backend", service_ms)
+
+    # ---- 지표 ----
+    def stats(self) -> dict:
+        with self._lock:
+            waits, services = list(self._wait_ms), list(self._service_ms)
+            out = dict(self.counts, queue_depth=self._queued, inflight=self._running)
+        out.update(
+            workers=self.workers,
+            max_queue=self.max_queue,
+            wait_p50_ms=round(percentile(waits, 0.50), 1),
+            wait_p95_ms=round(percentile(waits, 0.95), 1),
+            service_p50_ms=round(percentile(services, 0.50), 1),
+            service_p95_ms=round(percentile(services, 0.95), 1),
+        )
+        return out
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
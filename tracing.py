@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# tracing.py
+# -----------------------------------------------------------------------------
+# 경량 렌더링 계측(타이밍 스팬)
+# - with tracer.span("이름"): ... 형태로 구간 시간 측정
+# - 세션별 집계(count/total/max) + 스팬별 최근 샘플로 p50/p95 계산
+# - 출력: JSON lines 파일 + Prometheus 텍스트 포맷 (로컬 /metrics 엔드포인트)
+# - add_gauge()로 등록한 값(큐 길이 등)도 /metrics에 함께 노출
+# -----------------------------------------------------------------------------
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+
+
+def percentile(values, q: float) -> float:
+    """최근접 순위(nearest-rank) 백분위수. 값이 없으면 0.0"""
+    if not values:
+        return 0.0
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, math.ceil(q * len(s)) - 1))
+    return s[k]
+
+
+class Tracer:
+    """스팬 시간 기록기 (스레드 안전).
+
+    - samples: 스팬 이름별 최근 max_samples개 소요시간(ms)
+    - sessions: 세션별 {스팬: [count, total_ms, max_ms]}, 최근 max_sessions개만 유지
+    """
+
+    def __init__(self, jsonl_path: str | None = None, max_samples: int = 2048, max_sessions: int = 1000):
+        self.jsonl_path = jsonl_path
+        self.max_samples = max_samples
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._totals: dict[str, list] = {}  # 스팬 → [count, sum_ms] (누적, Prometheus용)
+        self._sessions: "OrderedDict[str, dict[str, list]]" = OrderedDict()
+        self._gauges: dict[str, tuple[Callable[[], float], str, str]] = {}
+        self._fh = None
+        self._fh_lock = threading.Lock()  # 파일 쓰기 전용 (집계 잠금과 분리)
+        if jsonl_path:
+            Path(jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(jsonl_path, "a", encoding="utf-8", buffering=1)
+
+    @contextmanager
+    def span(self, name: str, session: str | None = None, **attrs):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - t0) * 1000.0, session, attrs)
+
+    def record(self, name: str, dur_ms: float, session: str | None = None, attrs: dict | None = None):
+        with self._lock:
+            dq = self._samples.get(name)
+            if dq is None:
+                dq = self._samples[name] = deque(maxlen=self.max_samples)
+            dq.append(dur_ms)
+            tot = self._totals.setdefault(name, [0, 0.0])
+            tot[0] += 1
+            tot[1] += dur_ms
+            if session:
+                agg = self._sessions.get(session)
+                if agg is None:
+                    agg = self._sessions[session] = {}
+                    while len(self._sessions) > self.max_sessions:
+                        self._sessions.popitem(last=False)
+                else:
+                    self._sessions.move_to_end(session)
+                a = agg.setdefault(name, [0, 0.0, 0.0])
+                a[0] += 1
+                a[1] += dur_ms
+                a[2] = max(a[2], dur_ms)
+        # 파일 쓰기는 집계 잠금 밖에서 (다른 세션의 스팬 기록이 파일 I/O를 기다리지 않음)
+        if self._fh is not None:
+            rec = {
+                "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "span": name,
+                "ms": round(dur_ms, 3),
+                "session": session,
+            }
+            if attrs:
+                rec["attrs"] = {k: str(v) for k, v in attrs.items()}
+            line = json.dumps(rec, ensure_ascii=False) + "\n"
+            with self._fh_lock:
+                self._fh.write(line)
+
+    def add_gauge(self, name: str, fn: Callable[[], float], help_text: str = "", kind: str = "gauge") -> None:
+        """/metrics 출력 시 fn()을 호출해 app_<name> 값으로 노출 (kind: gauge/counter)"""
+        with self._lock:
+            self._gauges[name] = (fn, help_text, kind)
+
+    # ---- 조회 ----
+    def summary(self) -> dict:
+        """스팬별 {count, sum_ms, p50_ms, p95_ms, max_ms}"""
+        with self._lock:
+            items = {k: list(v) for k, v in self._samples.items()}
+            totals = {k: list(v) for k, v in self._totals.items()}
+        return {
+            k: {
+                "count": totals[k][0],
+                "sum_ms": round(totals[k][1], 3),
+                "p50_ms": round(percentile(v, 0.50), 3),
+                "p95_ms": round(percentile(v, 0.95), 3),
+                "max_ms": round(max(v), 3) if v else 0.0,
+            }
+            for k, v in sorted(items.items())
+        }
+
+    def session_summary(self, session: str) -> dict:
+        """세션 하나의 스팬별 {count, total_ms, max_ms}"""
+        with self._lock:
+            agg = {k: list(v) for k, v in self._sessions.get(session, {}).items()}
+        return {k: {"count": c, "total_ms": round(t, 3), "max_ms": round(m, 3)} for k, (c, t, m) in agg.items()}
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP app_span_duration_ms Render/load span duration in milliseconds.",
+            "# TYPE app_span_duration_ms summary",
+        ]
+        for name, s in self.summary().items():
+            lbl = name.replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(f'app_span_duration_ms{{span="{lbl}",quantile="0.5"}} {s["p50_ms"]}')
+            lines.append(f'app_span_duration_ms{{span="{lbl}",quantile="0.95"}} {s["p95_ms"]}')
+            lines.append(f'app_span_duration_ms_sum{{span="{lbl}"}} {s["sum_ms"]}')
+            lines.append(f'app_span_duration_ms_count{{span="{lbl}"}} {s["count"]}')
+        with self._lock:
+            n_sessions = len(self._sessions)
+        lines.append("# HELP app_traced_sessions Sessions with recorded spans.")
+        lines.append("# TYPE app_traced_sessions gauge")
+        lines.append(f"app_traced_sessions {n_sessions}")
+        with self._lock:
+            gauges = list(self._gauges.items())
+        for name, (fn, help_text, kind) in gauges:
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            lines.append(f"# HELP app_{name} {help_text or name}")
+            lines.append(f"# TYPE app_{name} {kind}")
+            lines.append(f"app_{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    # ---- 로컬 메트릭 엔드포인트 ----
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """/metrics(Prometheus 텍스트), /spans(JSON 요약)를 제공하는 데몬 스레드 HTTP 서버"""
+        tracer = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body, ctype = tracer.prometheus_text().encode("utf-8"), "text/plain; version=0.0.4"
+                elif self.path.startswith("/spans"):
+                    body, ctype = json.dumps(tracer.summary(), ensure_ascii=False).encode("utf-8"), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        srv = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=srv.serve_forever, name="metrics-http", daemon=True).start()
+        return srv